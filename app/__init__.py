@@ -1,39 +1,157 @@
 import os
 from dotenv import load_dotenv
-from flask import Flask
+from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from app.constants import (DEFAULT_DATABASE_URI,DEFAULT_JWT_EXPIRATION_MINUTES,DEFAULT_SECRET_KEY)
+from app.constants import (DEFAULT_DATABASE_URI,DEFAULT_JWT_EXPIRATION_MINUTES,DEFAULT_SECRET_KEY,DEFAULT_SYNC_FETCH_CONCURRENCY,DEFAULT_SYNC_PREFETCH_PAGES,DEFAULT_SYNC_FANOUT,DEFAULT_SYNC_CHUNK_SIZE,DEFAULT_CACHE_LOCAL_MAX_ENTRIES,DEFAULT_CACHE_TTL_SECONDS,DEFAULT_AUTH_USER_CACHE_TTL_SECONDS,DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES,DEFAULT_AUTH_TOKEN_CACHE_MAX_ENTRIES,DEFAULT_PASSWORD_HASH_METHOD,DEFAULT_PASSWORD_HASH_TIMEOUT_SECONDS,DEFAULT_LAST_LOGIN_FLUSH_SECONDS,DEFAULT_RESPONSE_CACHE_TTL_SECONDS,DEFAULT_RESPONSE_CACHE_LOCAL_MAX_ENTRIES,DEFAULT_BULK_MAX_ITEMS,DEFAULT_DB_POOL_SIZE,DEFAULT_DB_MAX_OVERFLOW,DEFAULT_DB_POOL_TIMEOUT_SECONDS,DEFAULT_DB_POOL_RECYCLE_SECONDS,DEFAULT_DB_SQLITE_BUSY_TIMEOUT_MS,DEFAULT_QUERY_DETECTOR_REPEAT_THRESHOLD,DEFAULT_QUERY_DETECTOR_SLOW_MS)
+from app.cache import cache
+from app.database import engine_options, init_engine
 
 db = SQLAlchemy()
-migrate = Migrate()
 
-def create_app(): 
-    load_dotenv()
-    app = Flask(__name__)
+def _int_env(name, default):
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+def _bool_env(name, default):
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _configure(app):
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URI", DEFAULT_DATABASE_URI)
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["DB_POOL_SIZE"] = _int_env("DB_POOL_SIZE", DEFAULT_DB_POOL_SIZE)
+    app.config["DB_MAX_OVERFLOW"] = _int_env("DB_MAX_OVERFLOW", DEFAULT_DB_MAX_OVERFLOW)
+    app.config["DB_POOL_TIMEOUT_SECONDS"] = _int_env("DB_POOL_TIMEOUT_SECONDS", DEFAULT_DB_POOL_TIMEOUT_SECONDS)
+    app.config["DB_POOL_RECYCLE_SECONDS"] = _int_env("DB_POOL_RECYCLE_SECONDS", DEFAULT_DB_POOL_RECYCLE_SECONDS)
+    app.config["DB_POOL_PRE_PING"] = _bool_env("DB_POOL_PRE_PING", True)
+    app.config["DB_ISOLATION_LEVEL"] = os.getenv("DB_ISOLATION_LEVEL")
+    app.config["DB_STATEMENT_TIMEOUT_MS"] = _int_env("DB_STATEMENT_TIMEOUT_MS", 0)
+    app.config["DB_SQLITE_WAL"] = _bool_env("DB_SQLITE_WAL", True)
+    app.config["DB_SQLITE_BUSY_TIMEOUT_MS"] = _int_env("DB_SQLITE_BUSY_TIMEOUT_MS", DEFAULT_DB_SQLITE_BUSY_TIMEOUT_MS)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", app.config["SECRET_KEY"])
     app.config["BASE_RESPONSE_SCHEMA"] = None
-    expiration_env = os.getenv("JWT_EXPIRATION_MINUTES")
+    app.config["VALIDATION_ERROR_STATUS_CODE"] = 400
+    app.config["VALIDATION_ERROR_DESCRIPTION"] = "Validation error"
+    app.config["JWT_EXPIRATION_MINUTES"] = _int_env("JWT_EXPIRATION_MINUTES", DEFAULT_JWT_EXPIRATION_MINUTES)
+    app.config["SYNC_FETCH_CONCURRENCY"] = _int_env("SYNC_FETCH_CONCURRENCY", DEFAULT_SYNC_FETCH_CONCURRENCY)
+    app.config["SYNC_PREFETCH_PAGES"] = _int_env("SYNC_PREFETCH_PAGES", DEFAULT_SYNC_PREFETCH_PAGES)
+    app.config["SYNC_FANOUT"] = _bool_env("SYNC_FANOUT", DEFAULT_SYNC_FANOUT)
+    app.config["SYNC_CHUNK_SIZE"] = _int_env("SYNC_CHUNK_SIZE", DEFAULT_SYNC_CHUNK_SIZE)
+    app.config["CACHE_REDIS_URL"] = os.getenv("CACHE_REDIS_URL", os.getenv("REDIS_URL"))
+    app.config["CACHE_LOCAL_MAX_ENTRIES"] = _int_env("CACHE_LOCAL_MAX_ENTRIES", DEFAULT_CACHE_LOCAL_MAX_ENTRIES)
+    app.config["CACHE_DEFAULT_TTL_SECONDS"] = _int_env("CACHE_DEFAULT_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)
+    app.config["AUTH_TRUST_TOKEN_CLAIMS"] = _bool_env("AUTH_TRUST_TOKEN_CLAIMS", False)
+    app.config["AUTH_USER_CACHE_TTL_SECONDS"] = _int_env("AUTH_USER_CACHE_TTL_SECONDS", DEFAULT_AUTH_USER_CACHE_TTL_SECONDS)
+    app.config["AUTH_USER_CACHE_MAX_ENTRIES"] = _int_env("AUTH_USER_CACHE_MAX_ENTRIES", DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES)
+    app.config["AUTH_USER_CACHE_SHARED"] = _bool_env("AUTH_USER_CACHE_SHARED", False)
+    app.config["AUTH_TOKEN_CACHE_MAX_ENTRIES"] = _int_env("AUTH_TOKEN_CACHE_MAX_ENTRIES", DEFAULT_AUTH_TOKEN_CACHE_MAX_ENTRIES)
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", DEFAULT_PASSWORD_HASH_METHOD)
+    # Every web process has its own pool, so by default the cores are shared between them
+    app.config["PASSWORD_HASH_WORKERS"] = _int_env("PASSWORD_HASH_WORKERS", max((os.cpu_count() or 1) // _int_env("WEB_CONCURRENCY", 1), 1))
+    app.config["PASSWORD_HASH_MAX_PENDING"] = _int_env("PASSWORD_HASH_MAX_PENDING", app.config["PASSWORD_HASH_WORKERS"] * 4 or 1)
+    app.config["PASSWORD_HASH_TIMEOUT_SECONDS"] = _int_env("PASSWORD_HASH_TIMEOUT_SECONDS", DEFAULT_PASSWORD_HASH_TIMEOUT_SECONDS)
+    app.config["LAST_LOGIN_BUFFERED"] = _bool_env("LAST_LOGIN_BUFFERED", True)
+    app.config["LAST_LOGIN_FLUSH_SECONDS"] = _int_env("LAST_LOGIN_FLUSH_SECONDS", DEFAULT_LAST_LOGIN_FLUSH_SECONDS)
+    # Cached responses are only safe to share between processes through Redis
+    app.config["RESPONSE_CACHE_ENABLED"] = _bool_env("RESPONSE_CACHE_ENABLED", bool(app.config["CACHE_REDIS_URL"]))
+    app.config["RESPONSE_CACHE_TTL_SECONDS"] = _int_env("RESPONSE_CACHE_TTL_SECONDS", DEFAULT_RESPONSE_CACHE_TTL_SECONDS)
+    app.config["RESPONSE_CACHE_LOCAL_MAX_ENTRIES"] = _int_env("RESPONSE_CACHE_LOCAL_MAX_ENTRIES", DEFAULT_RESPONSE_CACHE_LOCAL_MAX_ENTRIES)
+    app.config["BULK_MAX_ITEMS"] = _int_env("BULK_MAX_ITEMS", DEFAULT_BULK_MAX_ITEMS)
+    app.config["METRICS_ENABLED"] = _bool_env("METRICS_ENABLED", True)
+    app.config["METRICS_SERVER_TIMING"] = _bool_env("METRICS_SERVER_TIMING", False)
+    app.config["QUERY_DETECTOR_ENABLED"] = _bool_env("QUERY_DETECTOR_ENABLED", False)
+    app.config["QUERY_DETECTOR_REPEAT_THRESHOLD"] = _int_env("QUERY_DETECTOR_REPEAT_THRESHOLD", DEFAULT_QUERY_DETECTOR_REPEAT_THRESHOLD)
+    app.config["QUERY_DETECTOR_SLOW_MS"] = _int_env("QUERY_DETECTOR_SLOW_MS", DEFAULT_QUERY_DETECTOR_SLOW_MS)
 
-    try:
-        expiration_minutes = (int(expiration_env) if expiration_env else DEFAULT_JWT_EXPIRATION_MINUTES)
-    except ValueError:
-        expiration_minutes = DEFAULT_JWT_EXPIRATION_MINUTES
+def _base_app():
+    load_dotenv()
+    app = Flask(__name__)
+    _configure(app)
+    return app
 
-    app.config["JWT_EXPIRATION_MINUTES"] = expiration_minutes
+def _init_database(app):
     db.init_app(app)
-    migrate.init_app(app, db)
-    from app.tasks.celery_app import celery_init_app
-    celery_init_app(app)
+    init_engine(app, db)
+    cache.init_app(app)
+    from app.query_detector import query_detector
+    query_detector.init_app(app, db)
+
+def _handle_validation_error(error):
+    # apiflask raises HTTPError for request bodies and query strings that fail their schema
+    return jsonify({
+        "error": error.message,
+        "message": error.detail
+    }), error.status_code
+
+# Each process role only imports and initializes what it uses: the web app
+# never loads Celery or Alembic, workers never load the API blueprints.
+def create_app():
+    """Web application: the API blueprints and the extensions their requests use."""
+    app = _base_app()
+    _init_database(app)
+    from app.metrics import metrics
+    metrics.init_app(app, db)
+
+    from app.routes.auth.principals import principal_cache
+    from app.routes.auth.tokens import token_cache
+    from app.routes.auth.passwords import password_hasher
+    from app.routes.auth.last_login import last_login_buffer
+    principal_cache.init_app(app)
+    token_cache.init_app(app)
+    password_hasher.init_app(app)
+    last_login_buffer.init_app(app)
+
+    from app.routes.car.caching import response_cache
+    response_cache.init_app(app)
+    from app.search import search_init_app
+    search_init_app(app)
 
     from app.routes.auth.apis import auth_bp
     from app.routes.car.apis import car_bp
-    from app.models import User, CarMake, CarModel, CarYear
+    from app.routes.health.apis import health_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(car_bp)
+    app.register_blueprint(health_bp)
+    from apiflask import HTTPError
+    app.register_error_handler(HTTPError, _handle_validation_error)
+
+    return app
 
+def create_worker_app():
+    """Celery worker application: database, cache and Celery, without the API."""
+    app = _base_app()
+    _init_database(app)
+
+    from app.routes.auth.last_login import last_login_buffer
+    last_login_buffer.init_app(app)
+    from app.search import search_init_app
+    search_init_app(app)
+
+    from app.tasks.factory import celery_init_app
+    celery_init_app(app)
+    return app
+
+def create_beat_app():
+    """Celery beat application: only the configuration the schedule is built from."""
+    app = _base_app()
+    from app.tasks.factory import celery_init_app
+    celery_init_app(app)
+    return app
+
+def create_migrate_app():
+    """Application for ``flask db`` commands: the database, Alembic and the models."""
+    from flask_migrate import Migrate
+    app = _base_app()
+    db.init_app(app)
+    Migrate(app, db)
+    # Autogenerate compares against every mapped table
+    from app.models import User, CarMake, CarModel, CarYear, SyncState, CarSearchTerm
     return app
@@ -0,0 +1,212 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TableVersions(NamedTuple):
+    # Changes whenever any of the tables is bumped, never repeats across cache epochs
+    tag: str
+    # Unix time of the latest bump (or of the epoch start when later)
+    modified: float
+
+
+def _new_epoch():
+    return f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+
+
+class Cache:
+    """Shared cache backed by Redis when ``CACHE_REDIS_URL`` is set, else in-process.
+
+    Besides plain key/value entries it keeps a version counter per table.
+    Writers bump the versions of the tables they changed and readers embed the
+    current version in their cache keys, so stale entries are never read again
+    and simply expire.
+    """
+
+    KEY_PREFIX = "flaskcars:"
+    VERSION_PREFIX = "version:"
+    MODIFIED_PREFIX = "modified:"
+    EPOCH_KEY = "epoch"
+
+    def __init__(self):
+        self._redis = None
+        self._local = TTLCache()
+        self._versions = {}
+        self._modified = {}
+        self._versions_lock = threading.Lock()
+        # Versions restart from zero with an empty store; the epoch tells them apart
+        self._epoch = _new_epoch()
+
+    def init_app(self, app):
+        url = app.config.get("CACHE_REDIS_URL")
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1) if url else None
+        self._local = TTLCache(max_entries=app.config["CACHE_LOCAL_MAX_ENTRIES"],
+                               ttl=app.config["CACHE_DEFAULT_TTL_SECONDS"])
+        app.extensions["cache"] = self
+        if not event.contains(Session, "after_flush", _collect_changed_tables):
+            event.listen(Session, "after_flush", _collect_changed_tables)
+            event.listen(Session, "after_commit", _bump_changed_tables)
+            event.listen(Session, "after_rollback", _discard_changed_tables)
+
+    @property
+    def redis(self):
+        """The shared Redis client, or None when running in-process only."""
+        return self._redis
+
+    def get(self, key):
+        if self._redis is None:
+            return self._local.get(key)
+        try:
+            value = self._redis.get(self.KEY_PREFIX + key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache read failed: {str(e)}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        if self._redis is None:
+            self._local.set(key, value, ttl)
+            return
+        try:
+            self._redis.set(self.KEY_PREFIX + key, json.dumps(value), ex=ttl or self._local.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Cache write failed: {str(e)}")
+
+    def delete(self, key):
+        if self._redis is None:
+            self._local.delete(key)
+            return
+        try:
+            self._redis.delete(self.KEY_PREFIX + key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache delete failed: {str(e)}")
+
+    def version(self, name):
+        """Current version of ``name``, or None when the shared store is unreachable."""
+        if self._redis is None:
+            return self._versions.get(name, 0)
+        try:
+            return int(self._redis.get(self.KEY_PREFIX + self.VERSION_PREFIX + name) or 0)
+        except redis.RedisError as e:
+            logger.warning(f"Cache version read failed: {str(e)}")
+            return None
+
+    def versions(self, *names):
+        """``TableVersions`` of ``names`` in one round trip, or None when the shared store is unreachable."""
+        if self._redis is None:
+            epoch = self._epoch
+            with self._versions_lock:
+                counters = [self._versions.get(name, 0) for name in names]
+                times = [self._modified.get(name) for name in names]
+        else:
+            epoch_key = self.KEY_PREFIX + self.EPOCH_KEY
+            keys = [self.KEY_PREFIX + self.VERSION_PREFIX + name for name in names]
+            keys += [self.KEY_PREFIX + self.MODIFIED_PREFIX + name for name in names]
+            try:
+                epoch, *values = self._redis.mget([epoch_key, *keys])
+                if epoch is None:
+                    self._redis.set(epoch_key, _new_epoch(), nx=True)
+                    epoch = self._redis.get(epoch_key)
+            except redis.RedisError as e:
+                logger.warning(f"Cache version read failed: {str(e)}")
+                return None
+            epoch = epoch.decode()
+            counters = [int(value or 0) for value in values[:len(names)]]
+            times = [float(value) if value else None for value in values[len(names):]]
+        started = float(epoch.split("-", 1)[0])
+        modified = max([started, *(t for t in times if t is not None)])
+        return TableVersions(".".join([epoch, *map(str, counters)]), modified)
+
+    def bump(self, *names):
+        now = time.time()
+        if self._redis is None:
+            with self._versions_lock:
+                for name in names:
+                    self._versions[name] = self._versions.get(name, 0) + 1
+                    self._modified[name] = now
+            return
+        try:
+            with self._redis.pipeline() as pipe:
+                for name in names:
+                    pipe.incr(self.KEY_PREFIX + self.VERSION_PREFIX + name)
+                    pipe.set(self.KEY_PREFIX + self.MODIFIED_PREFIX + name, now)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Cache version bump failed: {str(e)}")
+
+
+cache = Cache()
+
+# Session hooks: every committed ORM write bumps the versions of the tables it touched
+CHANGED_TABLES_KEY = "changed_tables"
+
+
+def mark_tables_changed(session, *tables):
+    """Register Core-level writes, which bypass flush, so the next commit bumps them."""
+    session.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault(CHANGED_TABLES_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        changed.add(instance.__table__.name)
+
+
+def _bump_changed_tables(session):
+    changed = session.info.pop(CHANGED_TABLES_KEY, None)
+    if changed:
+        cache.bump(*changed)
+
+
+def _discard_changed_tables(session):
+    session.info.pop(CHANGED_TABLES_KEY, None)
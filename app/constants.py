@@ -2,4 +2,46 @@
 DEFAULT_SECRET_KEY = "dev-secret-key"
 DEFAULT_DATABASE_URI = "sqlite:///app.db"
 DEFAULT_JWT_EXPIRATION_MINUTES = 60
-URL = "https://parseapi.back4app.com/classes/Car_Model_List?limit=10&excludeKeys=Category"
+DEFAULT_SYNC_FETCH_CONCURRENCY = 4
+DEFAULT_SYNC_PREFETCH_PAGES = 8
+DEFAULT_SYNC_FANOUT = True
+DEFAULT_SYNC_CHUNK_SIZE = 5000
+DEFAULT_CACHE_LOCAL_MAX_ENTRIES = 1024
+DEFAULT_CACHE_TTL_SECONDS = 300
+DEFAULT_AUTH_USER_CACHE_TTL_SECONDS = 60
+DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES = 10000
+DEFAULT_AUTH_TOKEN_CACHE_MAX_ENTRIES = 10000
+DEFAULT_PASSWORD_HASH_METHOD = "scrypt"
+DEFAULT_PASSWORD_HASH_TIMEOUT_SECONDS = 10
+DEFAULT_LAST_LOGIN_FLUSH_SECONDS = 30
+DEFAULT_RESPONSE_CACHE_TTL_SECONDS = 3600
+DEFAULT_RESPONSE_CACHE_LOCAL_MAX_ENTRIES = 4096
+DEFAULT_BULK_MAX_ITEMS = 1000
+DEFAULT_DB_POOL_SIZE = 10
+DEFAULT_DB_MAX_OVERFLOW = 20
+DEFAULT_DB_POOL_TIMEOUT_SECONDS = 10
+DEFAULT_DB_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_DB_SQLITE_BUSY_TIMEOUT_MS = 5000
+DEFAULT_QUERY_DETECTOR_REPEAT_THRESHOLD = 5
+DEFAULT_QUERY_DETECTOR_SLOW_MS = 200
+URL = "https://parseapi.back4app.com/classes/Car_Model_List"
+# Car data sync
+SYNC_MIN_YEAR = 2012
+SYNC_MAX_YEAR = 2022
+SYNC_BATCH_SIZE = 1000
+SYNC_PAGE_SIZE = 1000
+SYNC_EXCLUDE_KEYS = "Category"
+SYNC_REQUEST_TIMEOUT_SECONDS = 30
+SYNC_CURSOR_STATE_KEY = "car_sync.cursor"
+SYNC_WATERMARK_STATE_KEY = "car_sync.watermark"
+SYNC_SNAPSHOT_STATE_KEY = "car_sync.snapshot"
+SYNC_MODE_INCREMENTAL = "incremental"
+SYNC_MODE_FULL = "full"
+# Beat runs the full re-scan instead of the incremental sync one day a week (UTC)
+SYNC_SCHEDULE_HOUR = 3
+SYNC_INCREMENTAL_DAYS = "mon-sat"
+SYNC_FULL_DAYS = "sun"
+SYNC_MAX_RETRIES = 5
+SYNC_RETRY_BACKOFF_SECONDS = 30
+SYNC_RETRY_BACKOFF_MAX_SECONDS = 600
+SYNC_PROGRESS_INTERVAL_SECONDS = 5
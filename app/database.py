@@ -0,0 +1,125 @@
+import threading
+import time
+from prometheus_client import Counter, Gauge
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+# The same counters for /metrics, added up over every process there
+POOL_CHECKOUTS = Counter("db_pool_checkouts", "Connections checked out of the pool.")
+POOL_TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that gave up waiting for a connection.")
+POOL_WAIT_SECONDS = Counter("db_pool_wait_seconds", "Time spent waiting for pooled connections.")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently in use.", multiprocess_mode="livesum")
+
+
+class PoolMetrics:
+    """Connection checkouts of this process and the time spent waiting for them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        POOL_CHECKOUTS.inc()
+        POOL_WAIT_SECONDS.inc(seconds)
+
+    def timeout(self):
+        with self._lock:
+            self.timeouts += 1
+        POOL_TIMEOUTS.inc()
+
+    def snapshot(self, pool):
+        """Current pool gauges plus the checkout counters, as a plain dict."""
+        stats = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long every checkout waits (including connecting)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.timeout()
+            raise
+        finally:
+            pool_metrics.observe(time.perf_counter() - start)
+        POOL_CHECKED_OUT.inc()
+        return record
+
+    def _do_return_conn(self, record):
+        POOL_CHECKED_OUT.dec()
+        super()._do_return_conn(record)
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database URI."""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    options = {}
+    if config["DB_ISOLATION_LEVEL"]:
+        options["isolation_level"] = config["DB_ISOLATION_LEVEL"]
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection Flask-SQLAlchemy keeps for us
+        return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT_SECONDS"],
+        # Below MySQL's wait_timeout, so the server never closes a pooled connection first
+        pool_recycle=config["DB_POOL_RECYCLE_SECONDS"],
+        pool_pre_ping=config["DB_POOL_PRE_PING"],
+    )
+    if url.get_backend_name() == "mysql" and config["DB_STATEMENT_TIMEOUT_MS"]:
+        options["connect_args"] = {
+            "init_command": f"SET SESSION max_execution_time={int(config['DB_STATEMENT_TIMEOUT_MS'])}",
+        }
+    return options
+
+
+def _sqlite_pragmas(wal, busy_timeout_ms):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            # Readers no longer block the writer (and vice versa) for local runs
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.close()
+    return on_connect
+
+
+def init_engine(app, db):
+    """Attach per-connection setup to the app's engine; call after ``db.init_app``."""
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        event.listen(engine, "connect", _sqlite_pragmas(app.config["DB_SQLITE_WAL"],
+                                                        app.config["DB_SQLITE_BUSY_TIMEOUT_MS"]))
+    app.extensions["pool_metrics"] = pool_metrics
@@ -0,0 +1,169 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from apiflask.schema_adapters import registry as schema_adapters
+from apiflask.schema_adapters.marshmallow import MarshmallowAdapter
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ENDPOINT = "unmatched"
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Timings of the request being handled by this thread, None outside instrumented requests
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = ("start", "queries", "db_seconds", "serialize_seconds", "query_started")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.query_started = None
+
+    def server_timing(self, total):
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+
+def current_timings():
+    """Timings of the current request, or None when it is not instrumented."""
+    return _current.get()
+
+
+@contextmanager
+def serializing():
+    """Count the time spent in the block as serialization of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialize_seconds += time.perf_counter() - start
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def response(self, *args, **kwargs):
+        with serializing():
+            return super().response(*args, **kwargs)
+
+
+class TimedMarshmallowAdapter(MarshmallowAdapter):
+    """APIFlask's marshmallow adapter, timing the ``schema.dump`` of ``output`` responses."""
+
+    def serialize_output(self, data, many=False):
+        with serializing():
+            return super().serialize_output(data, many=many)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    if timings is not None:
+        timings.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    if timings is not None and timings.query_started is not None:
+        timings.queries += 1
+        timings.db_seconds += time.perf_counter() - timings.query_started
+        timings.query_started = None
+
+
+class RequestMetrics:
+    """Per-endpoint latency, SQL and serialization statistics.
+
+    Request hooks time every request, engine events count the statements it
+    executes and the time they take, and the JSON provider plus APIFlask's
+    output adapter measure serialization. When disabled (and without the
+    Server-Timing header) none of them are installed.
+
+    The numbers are prometheus_client metrics. With ``PROMETHEUS_MULTIPROC_DIR``
+    set (gunicorn.conf.py does) every process writes them to files there and
+    ``render`` adds up all processes, whichever worker serves the scrape.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.server_timing = False
+        labels = ("endpoint", "method")
+        self.requests = Counter("http_requests", "Handled requests.", (*labels, "status"))
+        self.duration = Histogram("http_request_duration_seconds", "Time to handle a request.",
+                                  labels, buckets=LATENCY_BUCKETS)
+        self.db = Histogram("http_request_db_seconds", "Time a request spent executing SQL statements.",
+                            labels, buckets=LATENCY_BUCKETS)
+        self.serialize = Histogram("http_request_serialize_seconds", "Time a request spent serializing its response.",
+                                   labels, buckets=LATENCY_BUCKETS)
+        self.queries = Histogram("http_request_db_queries", "SQL statements executed by a request.",
+                                 labels, buckets=QUERY_COUNT_BUCKETS)
+
+    def init_app(self, app, db):
+        """Install the hooks; call before the blueprints are imported so their schemas are timed."""
+        self.enabled = app.config["METRICS_ENABLED"]
+        self.server_timing = app.config["METRICS_SERVER_TIMING"]
+        app.extensions["metrics"] = self
+        if not self.enabled and not self.server_timing:
+            return
+        schema_adapters.register("marshmallow", TimedMarshmallowAdapter)
+        app.json = TimedJSONProvider(app)
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._clear)
+
+    def _start(self):
+        _current.set(RequestTimings())
+
+    def _finish(self, response):
+        timings = _current.get()
+        if timings is None:
+            return response
+        total = time.perf_counter() - timings.start
+        if self.enabled:
+            self.observe(request.endpoint or UNMATCHED_ENDPOINT, request.method, response.status_code, total, timings)
+        if self.server_timing:
+            response.headers["Server-Timing"] = timings.server_timing(total)
+        return response
+
+    def _clear(self, exc):
+        _current.set(None)
+
+    def observe(self, endpoint, method, status, total, timings):
+        self.requests.labels(endpoint, method, status).inc()
+        self.duration.labels(endpoint, method).observe(total)
+        self.db.labels(endpoint, method).observe(timings.db_seconds)
+        self.serialize.labels(endpoint, method).observe(timings.serialize_seconds)
+        self.queries.labels(endpoint, method).observe(timings.queries)
+
+    def render(self):
+        """Prometheus text of every metric, summed over all processes in multiprocess mode."""
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            MultiProcessCollector(registry)
+            return generate_latest(registry)
+        return generate_latest(REGISTRY)
+
+    def reset(self):
+        for metric in (self.requests, self.duration, self.db, self.serialize, self.queries):
+            metric.clear()
+
+
+metrics = RequestMetrics()
@@ -1,9 +1,13 @@
 from .user import User
 from .car import CarMake, CarModel, CarYear
+from .sync_state import SyncState
+from .search import CarSearchTerm
 
 __all__ = [
     "User",
     "CarMake",
     "CarModel",
     "CarYear",
+    "SyncState",
+    "CarSearchTerm",
 ]
@@ -6,6 +6,8 @@ from sqlalchemy import UniqueConstraint
 class CarMake(db.Model):
     __tablename__ = "car_makes"
 
+    __table_args__ = (UniqueConstraint("name", name="uq_car_make_name"),)
+
     # Keys for serialization
     ID_KEY = "id"
     NAME_KEY = "name"
@@ -14,7 +16,7 @@ class CarMake(db.Model):
     name = db.Column(db.String(255), nullable=False)
     
     # One-to-many relationship: CarMake has many CarModels
-    models = db.relationship("CarModel", back_populates="make", cascade="all, delete-orphan")
+    models = db.relationship("CarModel", back_populates="make", cascade="all, delete-orphan", order_by="CarModel.name")
     
     def __init__(self, name: str):
         self.name = name
@@ -28,6 +30,9 @@ class CarMake(db.Model):
 class CarModel(db.Model):
     __tablename__ = "car_models"
 
+    # Leads with make_id so it also serves as the index of the foreign key
+    __table_args__ = (UniqueConstraint("make_id", "name", name="uq_car_model_make_name"),)
+
     # Keys for serialization
     ID_KEY = "id"
     NAME_KEY = "name"
@@ -41,7 +46,7 @@ class CarModel(db.Model):
     make = db.relationship("CarMake", back_populates="models")
     
     # One-to-many relationship: CarModel has many CarYears
-    years = db.relationship("CarYear", back_populates="model", cascade="all, delete-orphan")
+    years = db.relationship("CarYear", back_populates="model", cascade="all, delete-orphan", order_by="CarYear.year")
     
     def __init__(self, name: str, make_id: str):
         self.name = name
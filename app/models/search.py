@@ -0,0 +1,26 @@
+from sqlalchemy.dialects import mysql
+from app import db
+
+# Words are stored case-folded; a binary collation keeps MySQL from merging accented variants
+WORD_TYPE = db.String(64).with_variant(mysql.VARCHAR(64, collation="utf8mb4_bin"), "mysql")
+
+
+class CarSearchTerm(db.Model):
+    """One word of a make's or model's searchable name.
+
+    Model entries also carry the words of their make, so "toyota cor" finds
+    the Corolla. ``make_id`` is the make itself for make entries and the
+    parent make for model entries, which lets a make rename or delete reach
+    every entry below it.
+    """
+    __tablename__ = "car_search_terms"
+
+    KIND_MAKE = "make"
+    KIND_MODEL = "model"
+
+    kind = db.Column(db.String(8), primary_key=True)
+    word = db.Column(WORD_TYPE, primary_key=True)
+    entity_id = db.Column(db.String(32), primary_key=True)
+    make_id = db.Column(db.String(32), nullable=False, index=True)
+
+    __table_args__ = (db.Index("ix_car_search_terms_entity_id", "entity_id"),)
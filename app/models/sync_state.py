@@ -0,0 +1,28 @@
+from datetime import datetime
+from app import db
+
+
+class SyncState(db.Model):
+    __tablename__ = "sync_state"
+
+    # Keys for serialization
+    KEY_KEY = "key"
+    VALUE_KEY = "value"
+    UPDATED_AT_KEY = "updated_at"
+
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.String(255))
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, key: str, value=None):
+        self.key = key
+        self.value = value
+
+    def to_dict(self):
+        return {
+            self.KEY_KEY: self.key,
+            self.VALUE_KEY: self.value,
+            self.UPDATED_AT_KEY: (
+                self.updated_at.isoformat() if self.updated_at else None
+            ),
+        }
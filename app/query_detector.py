@@ -0,0 +1,136 @@
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+ORIGIN_FRAMES = 3
+MAX_LOGGED_STATEMENT_LENGTH = 500
+
+# "IN (?, ?, ?)" and "IN (%s, %s)" are the same statement shape whatever the list length
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%s|%\(\w+\)s)(\s*,\s*(\?|%s|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements seen by the request or Celery task running in this context
+_scope = ContextVar("query_scope", default=None)
+
+
+def statement_shape(statement):
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(?)", statement)).strip()
+
+
+def _origin():
+    """The innermost application frames of the current stack, as "file:line in function"."""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < ORIGIN_FRAMES:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT) and filename != __file__:
+            frames.append(f"{os.path.relpath(filename, os.path.dirname(APP_ROOT))}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " <- ".join(frames) or "outside the app package"
+
+
+def _shorten(statement):
+    if len(statement) <= MAX_LOGGED_STATEMENT_LENGTH:
+        return statement
+    return statement[:MAX_LOGGED_STATEMENT_LENGTH] + "..."
+
+
+class QueryScope:
+    __slots__ = ("name", "counts", "origins")
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = Counter()
+        self.origins = {}
+
+
+class QueryDetector:
+    """Opt-in warnings about N+1 query patterns and slow statements.
+
+    Engine events see every statement. Within one request or Celery task,
+    a statement shape executed ``repeat_threshold`` times or more is logged
+    once the scope ends; any statement slower than ``slow_seconds`` is logged
+    right away. Both come with the application frames that issued them.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.repeat_threshold = None
+        self.slow_seconds = None
+
+    def init_app(self, app, db):
+        self.enabled = app.config["QUERY_DETECTOR_ENABLED"]
+        self.repeat_threshold = app.config["QUERY_DETECTOR_REPEAT_THRESHOLD"]
+        self.slow_seconds = app.config["QUERY_DETECTOR_SLOW_MS"] / 1000
+        app.extensions["query_detector"] = self
+        if not self.enabled:
+            return
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        app.before_request(self._open_request)
+        app.teardown_request(self._close_request)
+
+    @contextmanager
+    def scope(self, name):
+        """Collect the statements of the block (e.g. one task run) and report repeats at its end."""
+        if not self.enabled:
+            yield
+            return
+        scope = QueryScope(name)
+        token = _scope.set(scope)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+            self._report(scope)
+
+    def _open_request(self):
+        _scope.set(QueryScope(f"{request.method} {request.path}"))
+
+    def _close_request(self, exc):
+        scope = _scope.get()
+        _scope.set(None)
+        if scope is not None:
+            self._report(scope)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_detector_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_detector_start"].pop()
+        scope = _scope.get()
+        if elapsed >= self.slow_seconds:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s\n  at %s",
+                elapsed * 1000, scope.name if scope else "no request or task", _shorten(statement), _origin(),
+            )
+        if scope is None:
+            return
+        shape = statement_shape(statement)
+        scope.counts[shape] += 1
+        if scope.counts[shape] == self.repeat_threshold:
+            scope.origins[shape] = _origin()
+
+    def _report(self, scope):
+        for shape, count in scope.counts.items():
+            if count >= self.repeat_threshold:
+                logger.warning(
+                    "Possible N+1: %d identical statements in %s: %s\n  at %s",
+                    count, scope.name, _shorten(shape), scope.origins[shape],
+                )
+
+
+query_detector = QueryDetector()
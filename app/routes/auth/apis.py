@@ -2,12 +2,13 @@ from datetime import datetime, timedelta
 import jwt
 from flask import Blueprint, current_app, jsonify, request
 from sqlalchemy.exc import IntegrityError
-from werkzeug.security import check_password_hash, generate_password_hash
 from app.models import User
 from app import db
-from app.routes.auth.constants import (EMAIL_PASSWORD_REQUIRED_ERROR,INVALID_EMAIL_FORMAT_ERROR,EMAIL_ALREADY_REGISTERED_ERROR,INVALID_EMAIL_OR_PASSWORD_ERROR,LOGIN_COMPLETION_ERROR,JWT_EXPIRATION_MINUTES_CONFIG_KEY,JWT_SECRET_KEY_CONFIG_KEY,JWT_DEFAULT_EXPIRATION_MINUTES,JWT_ALGORITHM,JWT_SUBJECT_KEY,JWT_EMAIL_KEY,JWT_ISSUED_AT_KEY,JWT_EXPIRATION_KEY,EMAIL_REGEX,PASSWORD_REGEX,PASSWORD_REQUIREMENTS_MESSAGE)
+from app.routes.auth.constants import (EMAIL_PASSWORD_REQUIRED_ERROR,INVALID_EMAIL_FORMAT_ERROR,EMAIL_ALREADY_REGISTERED_ERROR,INVALID_EMAIL_OR_PASSWORD_ERROR,LOGIN_COMPLETION_ERROR,PASSWORD_HASHER_BUSY_ERROR,JWT_EXPIRATION_MINUTES_CONFIG_KEY,JWT_SECRET_KEY_CONFIG_KEY,JWT_DEFAULT_EXPIRATION_MINUTES,JWT_ALGORITHM,JWT_SUBJECT_KEY,JWT_EMAIL_KEY,JWT_ISSUED_AT_KEY,JWT_EXPIRATION_KEY,EMAIL_REGEX,PASSWORD_REGEX,PASSWORD_REQUIREMENTS_MESSAGE)
 from apiflask import APIBlueprint
 from app.routes.auth.schemas import UserSchema
+from app.routes.auth.passwords import PasswordHasherBusy, password_hasher
+from app.routes.auth.last_login import last_login_buffer
 
 auth_bp = APIBlueprint("auth", __name__, url_prefix="/auth")
 
@@ -37,7 +38,11 @@ def signup(json_data):
     if not PASSWORD_REGEX.match(password):
         return jsonify({"error": PASSWORD_REQUIREMENTS_MESSAGE}), 400
 
-    user = User(email=email, password_hash=generate_password_hash(password))
+    try:
+        password_hash = password_hasher.hash(password)
+    except PasswordHasherBusy:
+        return jsonify({"error": PASSWORD_HASHER_BUSY_ERROR}), 503
+    user = User(email=email, password_hash=password_hash)
     db.session.add(user)
     try:
         db.session.commit()
@@ -59,13 +64,29 @@ def login(json_data):
         return jsonify({"error": INVALID_EMAIL_FORMAT_ERROR}), 400
 
     user = db.session.query(User).filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
-        return jsonify({"error": INVALID_EMAIL_OR_PASSWORD_ERROR}), 401
-    user.last_login_at = datetime.utcnow()
     try:
-        db.session.commit()
+        if not user or not password_hasher.verify(user.password_hash, password):
+            return jsonify({"error": INVALID_EMAIL_OR_PASSWORD_ERROR}), 401
+        # Transparently upgrade hashes made with older cost parameters
+        rehashed = password_hasher.needs_rehash(user.password_hash)
+        if rehashed:
+            user.password_hash = password_hasher.hash(password)
+    except PasswordHasherBusy:
+        return jsonify({"error": PASSWORD_HASHER_BUSY_ERROR}), 503
+
+    last_login_at = datetime.utcnow()
+    if not last_login_buffer.enabled:
+        user.last_login_at = last_login_at
+    try:
+        if rehashed or not last_login_buffer.enabled:
+            db.session.commit()
+        if last_login_buffer.enabled:
+            # Flushed in bulk by flush_last_logins_task instead of a write per login
+            last_login_buffer.record(user.id, last_login_at)
     except Exception:
         db.session.rollback()
         return jsonify({"error": LOGIN_COMPLETION_ERROR}), 500
     token = _generate_access_token(user)
-    return jsonify({"user": user.to_dict(), "token": token}), 200
+    user_data = user.to_dict()
+    user_data[User.LAST_LOGIN_AT_KEY] = last_login_at.isoformat()
+    return jsonify({"user": user_data, "token": token}), 200
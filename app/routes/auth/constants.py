@@ -14,6 +14,7 @@ INVALID_EMAIL_FORMAT_ERROR = "Invalid email format."
 EMAIL_ALREADY_REGISTERED_ERROR = "Email is already registered."
 INVALID_EMAIL_OR_PASSWORD_ERROR = "Invalid email or password."
 LOGIN_COMPLETION_ERROR = "Unable to complete login at this time."
+PASSWORD_HASHER_BUSY_ERROR = "Server is busy, please retry shortly."
 # JWT configuration
 JWT_EXPIRATION_MINUTES_CONFIG_KEY = "JWT_EXPIRATION_MINUTES"
 JWT_SECRET_KEY_CONFIG_KEY = "JWT_SECRET_KEY"
@@ -24,3 +25,20 @@ JWT_SUBJECT_KEY = "sub"
 JWT_EMAIL_KEY = "email"
 JWT_ISSUED_AT_KEY = "iat"
 JWT_EXPIRATION_KEY = "exp"
+# Authenticated user cache configuration
+AUTH_TRUST_TOKEN_CLAIMS_CONFIG_KEY = "AUTH_TRUST_TOKEN_CLAIMS"
+AUTH_USER_CACHE_TTL_SECONDS_CONFIG_KEY = "AUTH_USER_CACHE_TTL_SECONDS"
+AUTH_USER_CACHE_MAX_ENTRIES_CONFIG_KEY = "AUTH_USER_CACHE_MAX_ENTRIES"
+AUTH_USER_CACHE_SHARED_CONFIG_KEY = "AUTH_USER_CACHE_SHARED"
+PRINCIPAL_CACHE_PREFIX = "principal"
+AUTH_TOKEN_CACHE_MAX_ENTRIES_CONFIG_KEY = "AUTH_TOKEN_CACHE_MAX_ENTRIES"
+# Password hashing configuration
+PASSWORD_HASH_METHOD_CONFIG_KEY = "PASSWORD_HASH_METHOD"
+PASSWORD_HASH_WORKERS_CONFIG_KEY = "PASSWORD_HASH_WORKERS"
+PASSWORD_HASH_MAX_PENDING_CONFIG_KEY = "PASSWORD_HASH_MAX_PENDING"
+PASSWORD_HASH_TIMEOUT_SECONDS_CONFIG_KEY = "PASSWORD_HASH_TIMEOUT_SECONDS"
+# Last login buffering
+LAST_LOGIN_BUFFERED_CONFIG_KEY = "LAST_LOGIN_BUFFERED"
+LAST_LOGIN_FLUSH_SECONDS_CONFIG_KEY = "LAST_LOGIN_FLUSH_SECONDS"
+LAST_LOGIN_BUFFER_KEY = "last_login"
+LAST_LOGIN_FLUSH_BATCH_SIZE = 1000
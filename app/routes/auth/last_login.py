@@ -0,0 +1,127 @@
+import logging
+import threading
+from datetime import datetime
+import redis
+from sqlalchemy import case, update
+from app import db
+from app.cache import cache
+from app.models import User
+from app.routes.auth.constants import (LAST_LOGIN_BUFFER_KEY,LAST_LOGIN_BUFFERED_CONFIG_KEY,LAST_LOGIN_FLUSH_BATCH_SIZE,LAST_LOGIN_FLUSH_SECONDS_CONFIG_KEY)
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """Coalesces ``users.last_login_at`` writes so login never waits on the database.
+
+    Logins are recorded in a Redis hash (one field per user, so repeated
+    logins overwrite each other) that the ``flush_last_logins_task`` beat job
+    drains with one bulk UPDATE. Without Redis, or while it is unreachable,
+    the buffer lives in process and a daemon thread flushes it on the same
+    interval.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.interval = None
+        self._app = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def init_app(self, app):
+        self.enabled = app.config[LAST_LOGIN_BUFFERED_CONFIG_KEY]
+        self.interval = app.config[LAST_LOGIN_FLUSH_SECONDS_CONFIG_KEY]
+        self._app = app
+
+    def record(self, user_id, when):
+        redis_client = cache.redis
+        if redis_client is not None:
+            try:
+                redis_client.hset(cache.KEY_PREFIX + LAST_LOGIN_BUFFER_KEY, user_id, when.isoformat())
+                return
+            except redis.RedisError as e:
+                # Keep logins working through a Redis outage; the in-process flusher writes it
+                logger.warning(f"Buffering last login in process: {str(e)}")
+        self._record_locally({user_id: when})
+
+    def _record_locally(self, pending, overwrite=True):
+        with self._lock:
+            for user_id, when in pending.items():
+                if overwrite:
+                    self._pending[user_id] = when
+                else:
+                    self._pending.setdefault(user_id, when)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+                self._flusher.start()
+
+    def take(self):
+        """Remove and return the buffered ``{user_id: datetime}`` logins."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        redis_client = cache.redis
+        if redis_client is None:
+            return pending
+        key = cache.KEY_PREFIX + LAST_LOGIN_BUFFER_KEY
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.hgetall(key)
+                pipe.delete(key)
+                shared, _ = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Last login buffer read failed: {str(e)}")
+            return pending
+        for user_id, when in shared.items():
+            user_id, when = user_id.decode(), datetime.fromisoformat(when.decode())
+            # A login buffered in process during an outage may be newer than Redis' copy
+            if user_id not in pending or pending[user_id] < when:
+                pending[user_id] = when
+        return pending
+
+    def flush(self):
+        """Write buffered logins with one UPDATE per batch; returns the number of users."""
+        pending = self.take()
+        items = list(pending.items())
+        try:
+            for start in range(0, len(items), LAST_LOGIN_FLUSH_BATCH_SIZE):
+                batch = dict(items[start:start + LAST_LOGIN_FLUSH_BATCH_SIZE])
+                db.session.execute(
+                    update(User)
+                    .where(User.id.in_(list(batch)))
+                    .values(last_login_at=case(batch, value=User.id))
+                    .execution_options(synchronize_session=False)
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self._restore(pending)
+            raise
+        return len(items)
+
+    def _restore(self, pending):
+        # Put logins back unless a newer one was recorded meanwhile
+        redis_client = cache.redis
+        if redis_client is not None:
+            key = cache.KEY_PREFIX + LAST_LOGIN_BUFFER_KEY
+            try:
+                with redis_client.pipeline() as pipe:
+                    for user_id, when in pending.items():
+                        pipe.hsetnx(key, user_id, when.isoformat())
+                    pipe.execute()
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Last login buffer restore failed: {str(e)}")
+        self._record_locally(pending, overwrite=False)
+
+    def _flush_periodically(self):
+        stop = threading.Event()
+        while not stop.wait(self.interval):
+            with self._app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Error flushing last logins: {str(e)}")
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,108 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.routes.auth.constants import (PASSWORD_HASH_MAX_PENDING_CONFIG_KEY,PASSWORD_HASH_METHOD_CONFIG_KEY,PASSWORD_HASH_TIMEOUT_SECONDS_CONFIG_KEY,PASSWORD_HASH_WORKERS_CONFIG_KEY)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every hashing slot is taken for longer than the configured timeout."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a dedicated, bounded process pool.
+
+    Key derivation is CPU bound, so running it in worker processes uses every
+    core instead of holding the request thread's GIL. At most
+    ``PASSWORD_HASH_MAX_PENDING`` hashes are queued or running; a request
+    waits at most ``PASSWORD_HASH_TIMEOUT_SECONDS`` for a slot and its result
+    together and then fails fast. A pool whose process died is replaced. With
+    ``PASSWORD_HASH_WORKERS=0`` hashing runs inline.
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.workers = 0
+        self.timeout = None
+        self._prefix = None
+        self._slots = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config[PASSWORD_HASH_METHOD_CONFIG_KEY]
+        self.workers = app.config[PASSWORD_HASH_WORKERS_CONFIG_KEY]
+        self.timeout = app.config[PASSWORD_HASH_TIMEOUT_SECONDS_CONFIG_KEY]
+        self._prefix = None
+        self._slots = threading.BoundedSemaphore(app.config[PASSWORD_HASH_MAX_PENDING_CONFIG_KEY])
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when ``pwhash`` was made with other parameters than the configured method."""
+        if self._prefix is None:
+            # werkzeug expands defaults (e.g. "scrypt" -> "scrypt:32768:8:1") in the stored hash
+            self._prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+        deadline = time.monotonic() + self.timeout
+        pool = self._executor()
+        try:
+            return self._attempt(pool, deadline, func, args)
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory), which breaks the whole pool
+            self._discard(pool)
+            return self._attempt(self._executor(), deadline, func, args)
+
+    def _attempt(self, pool, deadline, func, args):
+        if not self._slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            raise PasswordHasherBusy()
+        try:
+            future = pool.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job ends, so a job still running after its
+        # request timed out keeps counting towards the pending limit
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy()
+
+    def _discard(self, pool):
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self):
+        # Created lazily so pre-forking servers start the pool in each worker process.
+        # forkserver children start from a clean interpreter instead of forking a
+        # process that already runs request threads.
+        with self._pool_lock:
+            if self._pool is None:
+                context = multiprocessing.get_context("forkserver")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+
+password_hasher = PasswordHasher()
+atexit.register(password_hasher.shutdown)
@@ -0,0 +1,99 @@
+from typing import NamedTuple
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.cache import TTLCache, cache
+from app.models import User
+from app.routes.auth.constants import (AUTH_TRUST_TOKEN_CLAIMS_CONFIG_KEY,AUTH_USER_CACHE_MAX_ENTRIES_CONFIG_KEY,AUTH_USER_CACHE_SHARED_CONFIG_KEY,AUTH_USER_CACHE_TTL_SECONDS_CONFIG_KEY,JWT_EMAIL_KEY,JWT_SUBJECT_KEY,PRINCIPAL_CACHE_PREFIX)
+
+
+class Principal(NamedTuple):
+    """The authenticated user handed to views by ``token_required``."""
+
+    id: str
+    email: str
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class PrincipalCache:
+    """Bounded cache of verified users keyed by the token subject.
+
+    Entries live in process for ``AUTH_USER_CACHE_TTL_SECONDS``. With
+    ``AUTH_USER_CACHE_SHARED`` they are kept only in the shared cache instead,
+    so an invalidation in one process is seen by all of them.
+    """
+
+    def __init__(self):
+        self._local = TTLCache()
+        self._shared = False
+        self._ttl = None
+
+    def init_app(self, app):
+        self._ttl = app.config[AUTH_USER_CACHE_TTL_SECONDS_CONFIG_KEY]
+        self._local = TTLCache(max_entries=app.config[AUTH_USER_CACHE_MAX_ENTRIES_CONFIG_KEY], ttl=self._ttl)
+        self._shared = app.config[AUTH_USER_CACHE_SHARED_CONFIG_KEY]
+
+    def get(self, user_id):
+        if not self._shared:
+            return self._local.get(user_id)
+        data = cache.get(f"{PRINCIPAL_CACHE_PREFIX}:{user_id}")
+        return Principal(**data) if data is not None else None
+
+    def set(self, principal):
+        if self._shared:
+            cache.set(f"{PRINCIPAL_CACHE_PREFIX}:{principal.id}", principal.to_dict(), ttl=self._ttl)
+        else:
+            self._local.set(principal.id, principal)
+
+    def invalidate(self, user_id):
+        if self._shared:
+            cache.delete(f"{PRINCIPAL_CACHE_PREFIX}:{user_id}")
+        else:
+            self._local.delete(user_id)
+
+
+principal_cache = PrincipalCache()
+
+
+def load_principal(payload):
+    """Return the Principal for a verified token payload, or None if the user is gone."""
+    user_id = payload[JWT_SUBJECT_KEY]
+    if current_app.config[AUTH_TRUST_TOKEN_CLAIMS_CONFIG_KEY]:
+        # Stateless mode: the signature is the only check until the token expires
+        return Principal(id=user_id, email=payload.get(JWT_EMAIL_KEY))
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.session.get(User, user_id)
+        if not user:
+            return None
+        principal = Principal(id=user.id, email=user.email)
+        principal_cache.set(principal)
+    return principal
+
+
+# Users changed in a session are invalidated once it commits; evicting them at
+# flush time would let a concurrent request cache the old row again meanwhile
+CHANGED_USERS_KEY = "changed_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, user):
+    session = object_session(user)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(CHANGED_USERS_KEY, None)
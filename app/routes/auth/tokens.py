@@ -0,0 +1,75 @@
+import hashlib
+import time
+import jwt
+from flask import current_app
+from prometheus_client import Counter
+from app.cache import TTLCache
+from app.routes.auth.constants import (AUTH_TOKEN_CACHE_MAX_ENTRIES_CONFIG_KEY,JWT_ALGORITHM,JWT_EXPIRATION_KEY,JWT_SECRET_KEY_CONFIG_KEY)
+
+
+TOKEN_CACHE_REQUESTS = Counter("auth_token_cache_requests", "Token cache lookups.", ("result",))
+_TOKEN_CACHE_HITS = TOKEN_CACHE_REQUESTS.labels("hit")
+_TOKEN_CACHE_MISSES = TOKEN_CACHE_REQUESTS.labels("miss")
+
+
+class TokenCache:
+    """Validated JWT payloads keyed by a SHA-256 digest of the raw token.
+
+    An entry never outlives the token's ``exp`` claim, so an expired token is
+    always re-verified (and rejected) by PyJWT. Lookups are counted in the
+    ``auth_token_cache_requests`` metric by result.
+    """
+
+    def __init__(self):
+        self._entries = TTLCache(max_entries=0)
+
+    def init_app(self, app):
+        self._entries = TTLCache(max_entries=app.config[AUTH_TOKEN_CACHE_MAX_ENTRIES_CONFIG_KEY])
+
+    @property
+    def enabled(self):
+        return self._entries.max_entries > 0
+
+    def get(self, token):
+        payload = self._entries.get(_digest(token))
+        if payload is not None and payload[JWT_EXPIRATION_KEY] <= time.time():
+            payload = None
+        (_TOKEN_CACHE_MISSES if payload is None else _TOKEN_CACHE_HITS).inc()
+        return payload
+
+    def set(self, token, payload):
+        # Without an exp claim there is no safe lifetime, so such tokens are always verified
+        expires_at = payload.get(JWT_EXPIRATION_KEY)
+        if expires_at is None:
+            return
+        ttl = expires_at - time.time()
+        if ttl > 0:
+            self._entries.set(_digest(token), payload, ttl=ttl)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+token_cache = TokenCache()
+
+
+def decode_token(token):
+    """Verify ``token`` and return its payload, skipping the HMAC check for cached tokens.
+
+    Raises the PyJWT errors of ``jwt.decode`` for invalid or expired tokens.
+    """
+    if not token_cache.enabled:
+        return _decode(token)
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = _decode(token)
+        token_cache.set(token, payload)
+    return payload
+
+
+def _decode(token):
+    return jwt.decode(token, current_app.config[JWT_SECRET_KEY_CONFIG_KEY], algorithms=[JWT_ALGORITHM])
@@ -1,26 +1,62 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from app.models import CarMake, CarModel, CarYear
 from app import db
 from sqlalchemy.exc import IntegrityError
-from werkzeug.exceptions import NotFound
-from app.routes.car.schemas import (CarMakeInputSchema,CarModelInputSchema,CarYearInputSchema,CarMakeOutputSchema,CarModelOutputSchema,CarYearOutputSchema, PaginationQuerySchema,genericPaginatedSchema)
-from app.routes.car.decorators import token_required, paginationSchema
+from werkzeug.exceptions import BadRequest, Conflict, NotFound
+from sqlalchemy.orm import selectinload
+from app.routes.car.schemas import (CarMakeInputSchema,CarModelInputSchema,CarYearInputSchema,CarMakeOutputSchema,CarModelOutputSchema,CarYearOutputSchema,CarMakeTreeSchema,CarMakeQuerySchema,CarModelQuerySchema,CarYearQuerySchema,ExportQuerySchema,CarMakeBulkUpdateSchema,CarModelBulkUpdateSchema,CarYearBulkUpdateSchema,BulkDeleteSchema,BulkResultSchema,SearchQuerySchema,SearchResultSchema,genericPaginatedSchema)
+from app.routes.car.decorators import token_required
+from app.routes.car.pagination import paginate_query
+from app.routes.car.filters import filter_makes, filter_models, filter_years
+from app.routes.car.caching import cached_response
+from app.routes.car.serializers import FlatSerializer, paginated_response
+from app.routes.car.export import export_response
+from app.search import search_names
+from app.routes.car.bulk import MAKE_SPEC, MODEL_SPEC, YEAR_SPEC, bulk_create, bulk_delete, bulk_update
+from app.routes.car.constants import BULK_CONFLICT_ERROR, BULK_EMPTY_ERROR, BULK_MAX_ITEMS_CONFIG_KEY, BULK_TOO_LARGE_ERROR, MAKE_CONFLICT_ERROR, MODEL_CONFLICT_ERROR, YEAR_CONFLICT_ERROR
 from apiflask import APIBlueprint
 
 
 car_bp = APIBlueprint("car", __name__, url_prefix="/cars")
 
+# List endpoints fetch bare columns and serialize them without marshmallow
+make_serializer = FlatSerializer(CarMakeOutputSchema, CarMake)
+model_serializer = FlatSerializer(CarModelOutputSchema, CarModel)
+year_serializer = FlatSerializer(CarYearOutputSchema, CarYear)
+
+
+def _run_bulk(operation, spec, items):
+    """Run a bulk write in one transaction and return the per-item results."""
+    limit = current_app.config[BULK_MAX_ITEMS_CONFIG_KEY]
+    if not items:
+        raise BadRequest(BULK_EMPTY_ERROR)
+    if len(items) > limit:
+        raise BadRequest(BULK_TOO_LARGE_ERROR.format(limit=limit))
+    try:
+        results = operation(spec, items)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise Conflict(BULK_CONFLICT_ERROR)
+    return {"results": results}
+
+def _commit(conflict_error):
+    """Commit a single-row write, turning a unique or foreign key violation into a 409."""
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise Conflict(conflict_error)
+
 #Car Make APIs
 @car_bp.route("/makes", methods=["GET"], strict_slashes=False)
 @token_required
-@car_bp.input(PaginationQuerySchema, location="query")
+@cached_response(CarMake.__tablename__)
+@car_bp.input(CarMakeQuerySchema, location="query")
 @car_bp.output(genericPaginatedSchema(CarMakeOutputSchema))
 def list_makes(current_user, query_data):
-    page = query_data["page"]
-    per_page = query_data["per_page"]
-    query = db.session.query(CarMake)
-    pagination = query.paginate(page=page, per_page=per_page)
-    return paginationSchema(pagination)
+    query = filter_makes(db.session.query(*make_serializer.columns), query_data)
+    return paginated_response(paginate_query(query, CarMake.id, query_data), make_serializer)
 
 @car_bp.route("/makes", methods=["POST"])
 @token_required
@@ -29,11 +65,12 @@ def list_makes(current_user, query_data):
 def create_make(current_user, json_data):
     make = CarMake(name=json_data["name"])
     db.session.add(make)
-    db.session.commit()
+    _commit(MAKE_CONFLICT_ERROR)
     return make
 
 @car_bp.route("/makes/<string:make_id>", methods=["GET"])
 @token_required
+@cached_response(CarMake.__tablename__, last_modified=True)
 @car_bp.output(CarMakeOutputSchema)
 def get_make(current_user, make_id):
     make = db.session.execute(db.select(CarMake).filter_by(id=make_id)).scalar_one_or_none()
@@ -41,6 +78,21 @@ def get_make(current_user, make_id):
         raise NotFound(f"Make with ID {make_id} not found")
     return make
 
+@car_bp.route("/makes/<string:make_id>/tree", methods=["GET"])
+@token_required
+@cached_response(CarMake.__tablename__, CarModel.__tablename__, CarYear.__tablename__, last_modified=True)
+@car_bp.output(CarMakeTreeSchema)
+def get_make_tree(current_user, make_id):
+    # Three queries in total (make, its models, their years) however many models there are
+    make = db.session.execute(
+        db.select(CarMake)
+        .options(selectinload(CarMake.models).selectinload(CarModel.years))
+        .filter_by(id=make_id)
+    ).scalar_one_or_none()
+    if not make:
+        raise NotFound(f"Make with ID {make_id} not found")
+    return make
+
 @car_bp.route("/makes/<string:make_id>", methods=["PUT"])
 @token_required
 @car_bp.input(CarMakeInputSchema)
@@ -50,7 +102,7 @@ def update_make(current_user, make_id, json_data):
     if not make:
         raise NotFound(f"Make with ID {make_id} not found")
     make.name = json_data["name"]
-    db.session.commit()
+    _commit(MAKE_CONFLICT_ERROR)
     return make
 
 @car_bp.route("/makes/<string:make_id>", methods=["DELETE"])
@@ -63,17 +115,36 @@ def delete_make(current_user, make_id):
     db.session.commit()
     return jsonify({"message": "Make deleted successfully"}), 200
 
+@car_bp.route("/makes/bulk", methods=["POST"])
+@token_required
+@car_bp.input(CarMakeInputSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_create_makes(current_user, json_data):
+    return _run_bulk(bulk_create, MAKE_SPEC, json_data)
+
+@car_bp.route("/makes/bulk", methods=["PUT"])
+@token_required
+@car_bp.input(CarMakeBulkUpdateSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_update_makes(current_user, json_data):
+    return _run_bulk(bulk_update, MAKE_SPEC, json_data)
+
+@car_bp.route("/makes/bulk", methods=["DELETE"])
+@token_required
+@car_bp.input(BulkDeleteSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_delete_makes(current_user, json_data):
+    return _run_bulk(bulk_delete, MAKE_SPEC, json_data)
+
 #Car Model APIs
 @car_bp.route("/models", methods=["GET"], strict_slashes=False)
 @token_required
-@car_bp.input(PaginationQuerySchema, location="query")
+@cached_response(CarModel.__tablename__)
+@car_bp.input(CarModelQuerySchema, location="query")
 @car_bp.output(genericPaginatedSchema(CarModelOutputSchema))
 def get_models(current_user, query_data):
-    page=query_data["page"]
-    per_page=query_data["per_page"]
-    query=db.session.query(CarModel)
-    pagination=query.paginate(page=page, per_page=per_page)
-    return paginationSchema(pagination)
+    query = filter_models(db.session.query(*model_serializer.columns), query_data)
+    return paginated_response(paginate_query(query, CarModel.id, query_data), model_serializer)
 
 @car_bp.route("/models", methods=["POST"])
 @token_required
@@ -82,11 +153,12 @@ def get_models(current_user, query_data):
 def create_model(current_user, json_data):
     model = CarModel(name=json_data["name"], make_id=json_data["make_id"])
     db.session.add(model)
-    db.session.commit()
+    _commit(MODEL_CONFLICT_ERROR)
     return model
 
 @car_bp.route("/models/<string:model_id>", methods=["GET"])
 @token_required
+@cached_response(CarModel.__tablename__, last_modified=True)
 @car_bp.output(CarModelOutputSchema)
 def get_model(current_user, model_id):
     model = db.session.execute(db.select(CarModel).filter_by(id=model_id)).scalar_one_or_none()
@@ -103,7 +175,7 @@ def update_model(current_user, model_id, json_data):
     if not model:
         raise NotFound(f"Model with ID {model_id} not found")
     model.name = json_data["name"]
-    db.session.commit()
+    _commit(MODEL_CONFLICT_ERROR)
     return model
 
 @car_bp.route("/models/<string:model_id>", methods=["DELETE"])
@@ -116,17 +188,36 @@ def delete_model(current_user, model_id):
     db.session.commit()
     return jsonify({"message": "Model deleted successfully"}), 200
 
+@car_bp.route("/models/bulk", methods=["POST"])
+@token_required
+@car_bp.input(CarModelInputSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_create_models(current_user, json_data):
+    return _run_bulk(bulk_create, MODEL_SPEC, json_data)
+
+@car_bp.route("/models/bulk", methods=["PUT"])
+@token_required
+@car_bp.input(CarModelBulkUpdateSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_update_models(current_user, json_data):
+    return _run_bulk(bulk_update, MODEL_SPEC, json_data)
+
+@car_bp.route("/models/bulk", methods=["DELETE"])
+@token_required
+@car_bp.input(BulkDeleteSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_delete_models(current_user, json_data):
+    return _run_bulk(bulk_delete, MODEL_SPEC, json_data)
+
 #Car Year APIs
 @car_bp.route("/years", methods=["GET"], strict_slashes=False)
 @token_required
-@car_bp.input(PaginationQuerySchema, location="query")
+@cached_response(CarYear.__tablename__)
+@car_bp.input(CarYearQuerySchema, location="query")
 @car_bp.output(genericPaginatedSchema(CarYearOutputSchema))
 def get_years(current_user, query_data):
-    page=query_data["page"]
-    per_page=query_data["per_page"]
-    query=db.session.query(CarYear)
-    pagination=query.paginate(page=page, per_page=per_page)
-    return paginationSchema(pagination)
+    query = filter_years(db.session.query(*year_serializer.columns), query_data)
+    return paginated_response(paginate_query(query, CarYear.id, query_data), year_serializer)
 
 @car_bp.route("/years", methods=["POST"])
 @token_required
@@ -135,11 +226,12 @@ def get_years(current_user, query_data):
 def create_year(current_user, json_data):
     year = CarYear(year=json_data["year"], model_id=json_data["model_id"])
     db.session.add(year)
-    db.session.commit()
+    _commit(YEAR_CONFLICT_ERROR)
     return year
 
 @car_bp.route("/years/<string:year_id>", methods=["GET"])
 @token_required
+@cached_response(CarYear.__tablename__, last_modified=True)
 @car_bp.output(CarYearOutputSchema)
 def get_year(current_user, year_id):
     year = db.session.execute(db.select(CarYear).filter_by(id=year_id)).scalar_one_or_none()
@@ -156,7 +248,7 @@ def update_year(current_user, year_id, json_data):
     if not year:
         raise NotFound(f"Year with ID {year_id} not found")
     year.year = json_data["year"]
-    db.session.commit()
+    _commit(YEAR_CONFLICT_ERROR)
     return year
 
 @car_bp.route("/years/<string:year_id>", methods=["DELETE"])
@@ -169,6 +261,50 @@ def delete_year(current_user, year_id):
     db.session.commit()
     return jsonify({"message": "Year deleted successfully"}), 200
 
+@car_bp.route("/years/bulk", methods=["POST"])
+@token_required
+@car_bp.input(CarYearInputSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_create_years(current_user, json_data):
+    return _run_bulk(bulk_create, YEAR_SPEC, json_data)
+
+@car_bp.route("/years/bulk", methods=["PUT"])
+@token_required
+@car_bp.input(CarYearBulkUpdateSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_update_years(current_user, json_data):
+    return _run_bulk(bulk_update, YEAR_SPEC, json_data)
+
+@car_bp.route("/years/bulk", methods=["DELETE"])
+@token_required
+@car_bp.input(BulkDeleteSchema(many=True))
+@car_bp.output(BulkResultSchema)
+def bulk_delete_years(current_user, json_data):
+    return _run_bulk(bulk_delete, YEAR_SPEC, json_data)
+
+#Search API
+@car_bp.route("/search", methods=["GET"])
+@token_required
+@cached_response(CarMake.__tablename__, CarModel.__tablename__)
+@car_bp.input(SearchQuerySchema, location="query")
+@car_bp.output(SearchResultSchema)
+def search_catalog(current_user, query_data):
+    makes, models = search_names(db.session, query_data["q"], query_data["limit"])
+    return {
+        "makes": [{"id": id, "name": name} for id, name in makes],
+        "models": [
+            {"id": id, "name": name, "make_id": make_id, "make": make}
+            for id, name, make_id, make in models
+        ],
+    }
+
+#Catalog Export API
+@car_bp.route("/export", methods=["GET"])
+@token_required
+@car_bp.input(ExportQuerySchema, location="query")
+def export_catalog(current_user, query_data):
+    return export_response(query_data["format"])
+
 #Error Handler
 @car_bp.errorhandler(NotFound)
 def handle_not_found(error):
@@ -176,3 +312,17 @@ def handle_not_found(error):
         "error": "Resource not found",
         "message": error.description
     }), 404
+
+@car_bp.errorhandler(Conflict)
+def handle_conflict(error):
+    return jsonify({
+        "error": "Conflict",
+        "message": error.description
+    }), 409
+
+@car_bp.errorhandler(BadRequest)
+def handle_bad_request(error):
+    return jsonify({
+        "error": "Bad request",
+        "message": error.description
+    }), 400
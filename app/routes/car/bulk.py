@@ -0,0 +1,153 @@
+import uuid
+from typing import NamedTuple
+from sqlalchemy import delete, insert, tuple_, update
+from app import db
+from app.cache import mark_tables_changed
+from app.search import reindex_entities
+from app.models import CarMake, CarModel, CarYear
+from app.routes.car.constants import (BULK_STATUS_CONFLICT,BULK_STATUS_CREATED,BULK_STATUS_DELETED,BULK_STATUS_INVALID,BULK_STATUS_NOT_FOUND,BULK_STATUS_UPDATED)
+
+
+class BulkSpec(NamedTuple):
+    model: type
+    # Natural key columns, as guarded by the table's unique constraint
+    key: tuple
+    # Foreign key column and the model it points to, if any
+    parent: tuple | None
+    # Columns a bulk update may change (same as the single-row PUT)
+    updatable: tuple
+
+
+MAKE_SPEC = BulkSpec(CarMake, ("name",), None, ("name",))
+MODEL_SPEC = BulkSpec(CarModel, ("make_id", "name"), ("make_id", CarMake), ("name",))
+YEAR_SPEC = BulkSpec(CarYear, ("model_id", "year"), ("model_id", CarModel), ("year",))
+
+# Rows that reference a model and have to go before it, as the ORM cascade does
+_CHILDREN = {CarMake: (CarModel, "make_id"), CarModel: (CarYear, "model_id")}
+
+
+def _fold(key):
+    # MySQL compares names case-insensitively, so batch duplicates are detected the same way
+    return tuple(value.casefold() if isinstance(value, str) else value for value in key)
+
+
+def _result(index, status, id=None, error=None):
+    return {"index": index, "id": id, "status": status, "error": error}
+
+
+def _existing_keys(spec, keys):
+    """Map folded natural keys that are already stored to their row ids."""
+    if not keys:
+        return {}
+    model = spec.model
+    columns = [getattr(model, name) for name in spec.key]
+    if len(columns) == 1:
+        condition = columns[0].in_([key[0] for key in keys])
+    else:
+        condition = tuple_(*columns).in_(list(keys))
+    rows = db.session.execute(db.select(model.id, *columns).where(condition))
+    return {_fold(row[1:]): row[0] for row in rows}
+
+
+def _existing_ids(model, ids):
+    if not ids:
+        return set()
+    return set(db.session.execute(db.select(model.id).where(model.id.in_(list(ids)))).scalars())
+
+
+def bulk_create(spec, items):
+    """Insert every valid item with one multi-row INSERT; the caller commits."""
+    results = []
+    parent_ids = None
+    if spec.parent:
+        column, parent_model = spec.parent
+        parent_ids = _existing_ids(parent_model, {item.get(column) for item in items} - {None})
+    existing = _existing_keys(spec, {tuple(item.get(name) for name in spec.key) for item in items})
+    seen = set()
+    rows = []
+    for index, item in enumerate(items):
+        key = tuple(item.get(name) for name in spec.key)
+        if parent_ids is not None and item.get(spec.parent[0]) not in parent_ids:
+            results.append(_result(index, BULK_STATUS_INVALID, error=f"{spec.parent[0]} does not exist"))
+        elif _fold(key) in existing or _fold(key) in seen:
+            results.append(_result(index, BULK_STATUS_CONFLICT, error=f"{'/'.join(spec.key)} already exists"))
+        else:
+            seen.add(_fold(key))
+            row = {"id": uuid.uuid4().hex, **{name: item[name] for name in spec.key}}
+            rows.append(row)
+            results.append(_result(index, BULK_STATUS_CREATED, id=row["id"]))
+    if rows:
+        db.session.execute(insert(spec.model.__table__), rows)
+        mark_tables_changed(db.session, spec.model.__tablename__)
+        reindex_entities(db.session.connection(), spec.model, [row["id"] for row in rows])
+    return results
+
+
+def bulk_update(spec, items):
+    """Apply every valid item with one executemany UPDATE by primary key; the caller commits."""
+    model = spec.model
+    ids = {item["id"] for item in items}
+    current = {
+        row[0]: row[1:]
+        for row in db.session.execute(
+            db.select(model.id, *[getattr(model, name) for name in spec.key]).where(model.id.in_(list(ids)))
+        )
+    }
+    new_keys = {}
+    for index, item in enumerate(items):
+        if item["id"] in current:
+            stored = dict(zip(spec.key, current[item["id"]]))
+            stored.update((name, item[name]) for name in spec.updatable)
+            new_keys[index] = tuple(stored[name] for name in spec.key)
+    existing = _existing_keys(spec, set(new_keys.values()))
+
+    results = []
+    seen_ids = set()
+    seen_keys = set()
+    rows = []
+    for index, item in enumerate(items):
+        if item["id"] not in current:
+            results.append(_result(index, BULK_STATUS_NOT_FOUND, id=item["id"]))
+            continue
+        key = _fold(new_keys[index])
+        if item["id"] in seen_ids:
+            results.append(_result(index, BULK_STATUS_CONFLICT, id=item["id"], error="id repeated in batch"))
+        elif existing.get(key, item["id"]) != item["id"] or key in seen_keys:
+            results.append(_result(index, BULK_STATUS_CONFLICT, id=item["id"], error=f"{'/'.join(spec.key)} already exists"))
+        else:
+            seen_ids.add(item["id"])
+            seen_keys.add(key)
+            rows.append({"id": item["id"], **{name: item[name] for name in spec.updatable}})
+            results.append(_result(index, BULK_STATUS_UPDATED, id=item["id"]))
+    if rows:
+        db.session.execute(update(model), rows)
+        mark_tables_changed(db.session, model.__tablename__)
+        reindex_entities(db.session.connection(), model, [row["id"] for row in rows])
+    return results
+
+
+def _delete_cascade(model, condition):
+    """Delete the rows of ``model`` matching ``condition`` and everything below them.
+
+    Children are selected through their parent table, never through the
+    table being deleted from, which MySQL rejects.
+    """
+    child = _CHILDREN.get(model)
+    if child:
+        child_model, column = child
+        _delete_cascade(child_model, getattr(child_model, column).in_(db.select(model.id).where(condition)))
+    db.session.execute(delete(model).where(condition))
+    mark_tables_changed(db.session, model.__tablename__)
+
+
+def bulk_delete(spec, items):
+    """Delete every existing item and its children with set-based DELETEs; the caller commits."""
+    existing = _existing_ids(spec.model, {item["id"] for item in items})
+    results = [
+        _result(index, BULK_STATUS_DELETED if item["id"] in existing else BULK_STATUS_NOT_FOUND, id=item["id"])
+        for index, item in enumerate(items)
+    ]
+    if existing:
+        _delete_cascade(spec.model, spec.model.id.in_(list(existing)))
+        reindex_entities(db.session.connection(), spec.model, existing)
+    return results
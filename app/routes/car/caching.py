@@ -0,0 +1,130 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request
+from app.cache import TTLCache, cache
+from app.routes.car.constants import (CACHE_STATUS_HEADER,RESPONSE_CACHE_ENABLED_CONFIG_KEY,RESPONSE_CACHE_LOCAL_MAX_ENTRIES_CONFIG_KEY,RESPONSE_CACHE_PREFIX,RESPONSE_CACHE_TTL_SECONDS_CONFIG_KEY)
+
+BODY_KEY = "body"
+STATUS_KEY = "status"
+MIMETYPE_KEY = "mimetype"
+
+
+class ResponseCache:
+    """Read-through cache of serialized GET responses.
+
+    Keys combine the route, the query string and the versions of the tables
+    the response is built from, so any committed write to those tables (API
+    handlers and the sync task alike) makes older entries unreachable.
+    Entries are kept in an in-process L1 in front of the shared Redis cache;
+    a hit costs one version lookup and no query or serialization. Nothing is
+    cached without Redis, whose versions are the only ones every process sees.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.ttl = None
+        self._local = TTLCache()
+
+    def init_app(self, app):
+        self.enabled = app.config[RESPONSE_CACHE_ENABLED_CONFIG_KEY]
+        self.ttl = app.config[RESPONSE_CACHE_TTL_SECONDS_CONFIG_KEY]
+        self._local = TTLCache(max_entries=app.config[RESPONSE_CACHE_LOCAL_MAX_ENTRIES_CONFIG_KEY], ttl=self.ttl)
+
+    @staticmethod
+    def key(tag):
+        """Cache key of the current request for the table version ``tag``."""
+        query = hashlib.sha1(repr(sorted(request.args.items(multi=True))).encode()).hexdigest()
+        return f"{RESPONSE_CACHE_PREFIX}:{request.path}:{query}:{tag}"
+
+    def get(self, key):
+        entry = self._local.get(key)
+        if entry is None:
+            entry = cache.get(key)
+            if entry is not None:
+                self._local.set(key, entry)
+        return entry
+
+    def set(self, key, response):
+        entry = {
+            BODY_KEY: response.get_data(as_text=True),
+            STATUS_KEY: response.status_code,
+            MIMETYPE_KEY: response.mimetype,
+        }
+        self._local.set(key, entry)
+        cache.set(key, entry, self.ttl)
+
+    def clear(self):
+        self._local.clear()
+
+    @staticmethod
+    def to_response(entry):
+        return current_app.response_class(entry[BODY_KEY], status=entry[STATUS_KEY], mimetype=entry[MIMETYPE_KEY])
+
+
+response_cache = ResponseCache()
+
+
+def _not_modified(etag, last_modified):
+    """True when the client's validators still match, per RFC 9110 precedence."""
+    if request.if_none_match:
+        # "*" only matches resources that exist, which needs the query to tell
+        return not request.if_none_match.star_tag and request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+
+
+def cached_response(*tables, last_modified=False):
+    """Serve a GET view from the response cache and answer conditional requests.
+
+    The strong ETag is derived from the table versions, so ``If-None-Match``
+    is answered with a 304 before the view runs any query or serialization.
+    With ``last_modified=True`` the time of the last write to the tables is
+    sent as ``Last-Modified`` too. Place it above ``input``/``output``.
+
+    Only the shared Redis cache sees every process's writes; without it the
+    view runs uncached and without validators.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if cache.redis is None:
+                return f(*args, **kwargs)
+            versions = cache.versions(*tables)
+            if versions is None:
+                return f(*args, **kwargs)
+            key = response_cache.key(versions.tag)
+            etag = hashlib.sha1(key.encode()).hexdigest()
+            modified = None
+            if last_modified:
+                # HTTP dates have a one second resolution
+                modified = datetime.fromtimestamp(int(versions.modified), tz=timezone.utc)
+            if _not_modified(etag, modified):
+                response = current_app.response_class(status=304)
+                _set_validators(response, etag, modified)
+                return response
+
+            if not response_cache.enabled:
+                response = current_app.make_response(f(*args, **kwargs))
+            else:
+                entry = response_cache.get(key)
+                if entry is not None:
+                    response = response_cache.to_response(entry)
+                    response.headers[CACHE_STATUS_HEADER] = "HIT"
+                else:
+                    response = current_app.make_response(f(*args, **kwargs))
+                    if response.status_code == 200:
+                        response_cache.set(key, response)
+                        response.headers[CACHE_STATUS_HEADER] = "MISS"
+            if response.status_code == 200:
+                _set_validators(response, etag, modified)
+            return response
+        return wrapper
+    return decorator
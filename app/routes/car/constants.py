@@ -0,0 +1,41 @@
+# Car route constants
+# Pagination
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 1000
+COUNT_CACHE_PREFIX = "count"
+# Response cache
+RESPONSE_CACHE_PREFIX = "response"
+RESPONSE_CACHE_ENABLED_CONFIG_KEY = "RESPONSE_CACHE_ENABLED"
+RESPONSE_CACHE_TTL_SECONDS_CONFIG_KEY = "RESPONSE_CACHE_TTL_SECONDS"
+RESPONSE_CACHE_LOCAL_MAX_ENTRIES_CONFIG_KEY = "RESPONSE_CACHE_LOCAL_MAX_ENTRIES"
+CACHE_STATUS_HEADER = "X-Cache"
+# Export
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = (EXPORT_FORMAT_NDJSON, EXPORT_FORMAT_CSV)
+EXPORT_MIMETYPES = {EXPORT_FORMAT_NDJSON: "application/x-ndjson", EXPORT_FORMAT_CSV: "text/csv"}
+EXPORT_BATCH_SIZE = 1000
+EXPORT_GZIP_LEVEL = 6
+# Search
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+# Bulk writes
+BULK_MAX_ITEMS_CONFIG_KEY = "BULK_MAX_ITEMS"
+BULK_STATUS_CREATED = "created"
+BULK_STATUS_UPDATED = "updated"
+BULK_STATUS_DELETED = "deleted"
+BULK_STATUS_NOT_FOUND = "not_found"
+BULK_STATUS_CONFLICT = "conflict"
+BULK_STATUS_INVALID = "invalid"
+# Error messages
+INVALID_CURSOR_ERROR = "Invalid pagination cursor."
+BULK_EMPTY_ERROR = "Expected a non-empty array of items."
+BULK_TOO_LARGE_ERROR = "At most {limit} items are accepted per request."
+BULK_CONFLICT_ERROR = "A concurrent write conflicts with this batch; nothing was written."
+MAKE_CONFLICT_ERROR = "A make with this name already exists."
+MODEL_CONFLICT_ERROR = "The make already has a model with this name, or the make does not exist."
+YEAR_CONFLICT_ERROR = "The model already has this year, or the model does not exist."
@@ -1,9 +1,8 @@
 from functools import wraps
 import jwt
-from flask import request, jsonify, current_app
-from app.models import User
-from app.routes.auth.constants import (JWT_SECRET_KEY_CONFIG_KEY,JWT_ALGORITHM,JWT_SUBJECT_KEY)
-from app import db
+from flask import request, jsonify
+from app.routes.auth.principals import load_principal
+from app.routes.auth.tokens import decode_token
 
 def token_required(f):
     @wraps(f)
@@ -28,15 +27,10 @@ def token_required(f):
             return jsonify({"error": "Authentication token is missing"}), 401
 
         try:
-            # Decode the token
-            payload = jwt.decode(
-                token, 
-                current_app.config[JWT_SECRET_KEY_CONFIG_KEY], 
-                algorithms=[JWT_ALGORITHM]
-            )
-            # Get the user ID from the token subject
-            user_id = payload[JWT_SUBJECT_KEY]
-            current_user = db.session.get(User, user_id)
+            # Decode the token (verified payloads of hot tokens are cached until exp)
+            payload = decode_token(token)
+            # Resolve the user from the token subject (cached, or trusted from the claims)
+            current_user = load_principal(payload)
             if not current_user:
                 return jsonify({"error": "Invalid authentication token"}), 401
             
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import zlib
+from flask import Response, request, stream_with_context
+from app import db
+from app.models import CarMake, CarModel, CarYear
+from app.routes.car.constants import EXPORT_BATCH_SIZE, EXPORT_FORMAT_CSV, EXPORT_GZIP_LEVEL, EXPORT_MIMETYPES
+
+# Columns of every exported row, in CSV header order
+EXPORT_COLUMNS = ("make_id", "make", "model_id", "model", "year_id", "year")
+
+
+def catalog_rows(batch_size=EXPORT_BATCH_SIZE):
+    """Yield batches of flat catalog rows from a server-side cursor.
+
+    Make and model names are joined in SQL and only plain tuples are built,
+    so memory stays at one batch whatever the catalog size.
+    """
+    stmt = (
+        db.select(CarMake.id, CarMake.name, CarModel.id, CarModel.name, CarYear.id, CarYear.year)
+        .join(CarModel, CarModel.make_id == CarMake.id)
+        .join(CarYear, CarYear.model_id == CarModel.id)
+        .order_by(CarMake.name, CarModel.name, CarYear.year)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.session.execute(stmt)
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _ndjson(batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":")) + "\n" for row in rows
+        )
+
+
+def _csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when the catalog is empty
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(export_format):
+    """Streaming response with the whole catalog, gzipped when the client accepts it."""
+    encode = _csv if export_format == EXPORT_FORMAT_CSV else _ndjson
+    chunks = encode(catalog_rows())
+    headers = {"Vary": "Accept-Encoding"}
+    if request.accept_encodings["gzip"] > 0:
+        chunks = _gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers=headers,
+    )
@@ -0,0 +1,28 @@
+from app.models import CarMake, CarModel, CarYear
+
+
+def _name_prefix(query, column, prefix):
+    # A LIKE 'prefix%' condition can use the index on the name column
+    if prefix:
+        query = query.filter(column.startswith(prefix, autoescape=True))
+    return query
+
+
+def filter_makes(query, query_data):
+    return _name_prefix(query, CarMake.name, query_data.get("name_prefix"))
+
+
+def filter_models(query, query_data):
+    if "make_id" in query_data:
+        query = query.filter(CarModel.make_id == query_data["make_id"])
+    return _name_prefix(query, CarModel.name, query_data.get("name_prefix"))
+
+
+def filter_years(query, query_data):
+    if "model_id" in query_data:
+        query = query.filter(CarYear.model_id == query_data["model_id"])
+    if "year_min" in query_data:
+        query = query.filter(CarYear.year >= query_data["year_min"])
+    if "year_max" in query_data:
+        query = query.filter(CarYear.year <= query_data["year_max"])
+    return query
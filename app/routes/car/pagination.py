@@ -0,0 +1,120 @@
+import base64
+import hashlib
+import json
+import math
+from sqlalchemy import text
+from werkzeug.exceptions import BadRequest
+from app import db
+from app.cache import cache
+from app.routes.car.constants import COUNT_CACHE_PREFIX, COUNT_ESTIMATE, COUNT_NONE, INVALID_CURSOR_ERROR
+from app.routes.car.decorators import paginationSchema
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps([value]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the id inside a cursor made by ``encode_cursor``; anything else is a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise BadRequest(INVALID_CURSOR_ERROR)
+    if not (isinstance(value, list) and len(value) == 1 and isinstance(value[0], str)):
+        raise BadRequest(INVALID_CURSOR_ERROR)
+    return value[0]
+
+
+def _query_digest(query):
+    compiled = query.statement.compile()
+    key = str(compiled) + repr(sorted(compiled.params.items()))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _estimate_rows(table):
+    """Row count from the table statistics, which costs no scan (MySQL only)."""
+    if db.session.get_bind().dialect.name != "mysql":
+        return None
+    return db.session.execute(
+        text("SELECT TABLE_ROWS FROM information_schema.TABLES "
+             "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"),
+        {"table": table},
+    ).scalar()
+
+
+def count_rows(query, table, mode):
+    """Total rows of ``query`` according to the ``count`` query parameter.
+
+    With Redis, exact counts are cached per table and filter under the
+    table's version tag, which every commit touching the table (or a cache
+    reset) changes.
+    """
+    if mode == COUNT_NONE:
+        return None
+    if mode == COUNT_ESTIMATE and query.whereclause is None:
+        estimate = _estimate_rows(table)
+        if estimate is not None:
+            return estimate
+    # Without Redis the versions are per process and miss other workers' writes
+    versions = cache.versions(table) if cache.redis is not None else None
+    if versions is None:
+        return query.order_by(None).count()
+    key = f"{COUNT_CACHE_PREFIX}:{table}:{versions.tag}:{_query_digest(query)}"
+    total = cache.get(key)
+    if total is None:
+        total = query.order_by(None).count()
+        cache.set(key, total)
+    return total
+
+
+def keyset_paginate(query, column, cursor, per_page, total=None):
+    """Seek past ``cursor`` on the indexed ``column`` instead of using OFFSET.
+
+    Every page costs one index range scan no matter how deep it is. One extra
+    row is fetched to know whether there is a next page.
+    """
+    if cursor:
+        query = query.filter(column > decode_cursor(cursor))
+    rows = query.order_by(column).limit(per_page + 1).all()
+    items = rows[:per_page]
+    has_next = len(rows) > per_page
+    return {
+        "items": items,
+        "pagination": {
+            "per_page": per_page,
+            "pages": math.ceil(total / per_page) if total is not None else None,
+            "total": total,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(getattr(items[-1], column.key)) if has_next else None,
+        }
+    }
+
+
+def offset_paginate(query, page, per_page):
+    """OFFSET page without a total; one extra row tells whether there is a next page."""
+    rows = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    return {
+        "items": rows[:per_page],
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "pages": None,
+            "total": None,
+            "has_next": has_next,
+        }
+    }
+
+
+def paginate_query(query, column, query_data):
+    """Paginate a list query with OFFSET pages, or keyset pages when a cursor is passed."""
+    per_page = query_data["per_page"]
+    total = count_rows(query, column.table.name, query_data["count"])
+    if "cursor" in query_data:
+        return keyset_paginate(query, column, query_data["cursor"], per_page, total=total)
+    if total is None:
+        return offset_paginate(query, query_data["page"], per_page)
+    pagination = query.paginate(page=query_data["page"], per_page=per_page, count=False)
+    pagination.total = total
+    return paginationSchema(pagination)
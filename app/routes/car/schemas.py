@@ -1,6 +1,9 @@
+from functools import cache
 from marshmallow import Schema, fields
-from apiflask.fields import String, Integer, List, Nested
+from apiflask.fields import Boolean, String, Integer, List, Nested
+from apiflask.validators import OneOf, Range
 from apiflask import PaginationSchema
+from app.routes.car.constants import COUNT_EXACT, COUNT_MODES, DEFAULT_PER_PAGE, MAX_PER_PAGE, EXPORT_FORMAT_NDJSON, EXPORT_FORMATS, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
 
 #Input Schemas
 class CarMakeInputSchema(Schema):
@@ -14,6 +17,20 @@ class CarYearInputSchema(Schema):
     year = Integer(required=True)
     model_id = String()  
 
+class CarMakeBulkUpdateSchema(CarMakeInputSchema):
+    id = String(required=True)
+
+class CarModelBulkUpdateSchema(Schema):
+    id = String(required=True)
+    name = String(required=True)
+
+class CarYearBulkUpdateSchema(Schema):
+    id = String(required=True)
+    year = Integer(required=True)
+
+class BulkDeleteSchema(Schema):
+    id = String(required=True)
+
 #Output Schemas
 class CarMakeOutputSchema(Schema):
     id = String()
@@ -29,14 +46,65 @@ class CarYearOutputSchema(Schema):
     year = Integer()
     model_id = String()
 
+class CarModelTreeSchema(CarModelOutputSchema):
+    years = List(Nested(CarYearOutputSchema))
+
+class CarMakeTreeSchema(CarMakeOutputSchema):
+    models = List(Nested(CarModelTreeSchema))
+
+class BulkItemResultSchema(Schema):
+    index = Integer()
+    id = String(allow_none=True)
+    status = String()
+    error = String(allow_none=True)
+
+class BulkResultSchema(Schema):
+    results = List(Nested(BulkItemResultSchema))
+
+class CarModelSearchSchema(CarModelOutputSchema):
+    make = String()
+
+class SearchResultSchema(Schema):
+    makes = List(Nested(CarMakeOutputSchema))
+    models = List(Nested(CarModelSearchSchema))
+
 #pagination Schemas
+class CursorPaginationSchema(PaginationSchema):
+    pages = Integer(allow_none=True)
+    total = Integer(allow_none=True)
+    has_next = Boolean()
+    next_cursor = String(allow_none=True)
+
+@cache
 def genericPaginatedSchema(itemSchema):
     class GenericPaginatedSchema(Schema):
         items = List(Nested(itemSchema))
-        pagination = Nested(PaginationSchema)
+        pagination = Nested(CursorPaginationSchema)
     return GenericPaginatedSchema
 
 # Pagination Query Parameters Schema
 class PaginationQuerySchema(Schema):
-    page = Integer(load_default=1, metadata={'description': 'Page number'})
-    per_page = Integer(load_default=10, metadata={'description': 'Items per page'})
+    page = Integer(load_default=1, validate=Range(min=1), metadata={'description': 'Page number'})
+    per_page = Integer(load_default=DEFAULT_PER_PAGE, validate=Range(min=1, max=MAX_PER_PAGE), metadata={'description': f'Items per page (at most {MAX_PER_PAGE})'})
+    cursor = String(metadata={'description': 'Keyset pagination cursor (next_cursor of the previous page, empty for the first page); page is ignored when set'})
+    count = String(load_default=COUNT_EXACT, validate=OneOf(COUNT_MODES), metadata={'description': 'Total count mode: exact (cached until the table changes), estimate (table statistics when available) or none'})
+
+# Filter Query Parameters Schemas
+class CarMakeQuerySchema(PaginationQuerySchema):
+    name_prefix = String(metadata={'description': 'Only makes whose name starts with this value'})
+
+class CarModelQuerySchema(PaginationQuerySchema):
+    make_id = String(metadata={'description': 'Only models of this make'})
+    name_prefix = String(metadata={'description': 'Only models whose name starts with this value'})
+
+class CarYearQuerySchema(PaginationQuerySchema):
+    model_id = String(metadata={'description': 'Only years of this model'})
+    year_min = Integer(metadata={'description': 'Only years from this value (inclusive)'})
+    year_max = Integer(metadata={'description': 'Only years up to this value (inclusive)'})
+
+class ExportQuerySchema(Schema):
+    format = String(load_default=EXPORT_FORMAT_NDJSON, validate=OneOf(EXPORT_FORMATS), metadata={'description': 'ndjson (one JSON object per line) or csv'})
+
+class SearchQuerySchema(Schema):
+    q = String(required=True, metadata={'description': 'Words to match, each as a prefix of a make or model name word (e.g. "toyota cor")'})
+    limit = Integer(load_default=SEARCH_DEFAULT_LIMIT, validate=Range(min=1, max=SEARCH_MAX_LIMIT), metadata={'description': 'Maximum makes and models returned'})
@@ -0,0 +1,68 @@
+from flask import jsonify
+from marshmallow import fields
+from app.metrics import serializing
+from app.routes.car.schemas import CursorPaginationSchema
+
+# Field types a flat serializer handles, with the conversion marshmallow applies on dump
+_CONVERTERS = ((fields.Integer, int), (fields.String, str))
+
+_pagination_schema = CursorPaginationSchema()
+
+
+def _converter(field):
+    for field_type, convert in _CONVERTERS:
+        if isinstance(field, field_type):
+            return convert
+    return None
+
+
+class FlatSerializer:
+    """Precomputed dumper for a flat output schema of plain String/Integer fields.
+
+    Rows are fetched as bare columns (see ``columns``), so no ORM objects are
+    hydrated, and turned into the same dicts ``schema.dump`` would produce
+    without marshmallow's per-field dispatch. Conversions are dropped when the
+    column already yields the dumped type.
+    """
+
+    def __init__(self, schema_cls, model):
+        keys, columns, converters = [], [], []
+        for name, field in schema_cls._declared_fields.items():
+            convert = _converter(field)
+            if convert is None:
+                raise TypeError(f"{schema_cls.__name__}.{name} is not a flat String/Integer field")
+            column = getattr(model, field.attribute or name)
+            keys.append(field.data_key or name)
+            columns.append(column)
+            converters.append(None if column.type.python_type is convert else convert)
+        self.keys = tuple(keys)
+        self.columns = tuple(columns)
+        self._converters = tuple(converters)
+        self._identity = not any(self._converters)
+
+    def dump(self, row):
+        if self._identity:
+            return dict(zip(self.keys, row))
+        return {
+            key: value if convert is None or value is None else convert(value)
+            for key, convert, value in zip(self.keys, self._converters, row)
+        }
+
+    def dump_many(self, rows):
+        if self._identity:
+            keys = self.keys
+            return [dict(zip(keys, row)) for row in rows]
+        return [self.dump(row) for row in rows]
+
+
+def paginated_response(result, serializer):
+    """JSON response for a ``paginate_query`` result over ``serializer.columns`` rows.
+
+    Matches what ``output(genericPaginatedSchema(...))`` renders for the same page.
+    """
+    with serializing():
+        body = {
+            "items": serializer.dump_many(result["items"]),
+            "pagination": _pagination_schema.dump(result["pagination"]),
+        }
+    return jsonify(body)
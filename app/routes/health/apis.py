@@ -0,0 +1,19 @@
+from flask import Blueprint, Response, jsonify
+from app import db
+from app.database import pool_metrics
+from app.metrics import CONTENT_TYPE, metrics
+
+health_bp = Blueprint("health", __name__)
+
+@health_bp.route("/health", methods=["GET"])
+def health():
+    return jsonify({
+        "status": "ok",
+        "database_pool": pool_metrics.snapshot(db.engine.pool),
+    }), 200
+
+@health_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    if not metrics.enabled:
+        return jsonify({"error": "Resource not found", "message": "Metrics are disabled."}), 404
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,121 @@
+import re
+from sqlalchemy import and_, delete, event, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+from app.models import CarMake, CarModel, CarSearchTerm
+
+WORD_PATTERN = re.compile(r"\w+")
+MAX_WORD_LENGTH = 64
+MAX_QUERY_WORDS = 5
+
+
+def words(text):
+    """Lower-cased words of ``text``, as stored in and looked up from the index."""
+    return [word[:MAX_WORD_LENGTH] for word in WORD_PATTERN.findall(text.casefold())]
+
+
+def _prefix_range(prefix):
+    # word >= "cor" AND word < "cos" is an index range scan on MySQL and SQLite alike
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _term_rows(kind, entity_id, make_id, *names):
+    return [
+        {"kind": kind, "word": word, "entity_id": entity_id, "make_id": make_id}
+        for word in {word for name in names for word in words(name)}
+    ]
+
+
+def reindex(connection, make_ids=(), model_ids=()):
+    """Rebuild the index entries of the given makes (with all their models) and models.
+
+    Entries of ids that no longer exist are simply dropped, so the same call
+    handles inserts, renames and deletes. Runs on the caller's connection
+    and transaction.
+    """
+    make_ids, model_ids = list(make_ids), list(model_ids)
+    if not make_ids and not model_ids:
+        return
+    conditions = []
+    if make_ids:
+        conditions.append(CarSearchTerm.make_id.in_(make_ids))
+    if model_ids:
+        conditions.append(CarSearchTerm.entity_id.in_(model_ids))
+    connection.execute(delete(CarSearchTerm).where(or_(*conditions)))
+
+    rows = []
+    if make_ids:
+        for make_id, name in connection.execute(select(CarMake.id, CarMake.name).where(CarMake.id.in_(make_ids))):
+            rows += _term_rows(CarSearchTerm.KIND_MAKE, make_id, make_id, name)
+    model_conditions = []
+    if make_ids:
+        model_conditions.append(CarModel.make_id.in_(make_ids))
+    if model_ids:
+        model_conditions.append(CarModel.id.in_(model_ids))
+    models = connection.execute(
+        select(CarModel.id, CarModel.make_id, CarModel.name, CarMake.name)
+        .join(CarMake, CarMake.id == CarModel.make_id)
+        .where(or_(*model_conditions))
+    )
+    for model_id, make_id, name, make_name in models:
+        rows += _term_rows(CarSearchTerm.KIND_MODEL, model_id, make_id, make_name, name)
+    if rows:
+        connection.execute(insert(CarSearchTerm), rows)
+
+
+def reindex_entities(connection, model, ids):
+    """``reindex`` for ids of ``model`` (CarMake or CarModel); other models are ignored."""
+    if model is CarMake:
+        reindex(connection, make_ids=ids)
+    elif model is CarModel:
+        reindex(connection, model_ids=ids)
+
+
+def _matching(kind, query_words):
+    """Conditions on an entity id requiring every query word to prefix one of its words."""
+    conditions = []
+    for word in query_words:
+        low, high = _prefix_range(word)
+        conditions.append(
+            select(CarSearchTerm.entity_id).where(
+                CarSearchTerm.kind == kind, CarSearchTerm.word >= low, CarSearchTerm.word < high
+            )
+        )
+    return conditions
+
+
+def search_names(session, query, limit):
+    """Return ``(makes, models)`` rows whose names match every word prefix in ``query``."""
+    query_words = words(query)[:MAX_QUERY_WORDS]
+    if not query_words:
+        return [], []
+    makes = session.execute(
+        select(CarMake.id, CarMake.name)
+        .where(and_(*(CarMake.id.in_(ids) for ids in _matching(CarSearchTerm.KIND_MAKE, query_words))))
+        .order_by(CarMake.name)
+        .limit(limit)
+    ).all()
+    models = session.execute(
+        select(CarModel.id, CarModel.name, CarModel.make_id, CarMake.name)
+        .join(CarMake, CarMake.id == CarModel.make_id)
+        .where(and_(*(CarModel.id.in_(ids) for ids in _matching(CarSearchTerm.KIND_MODEL, query_words))))
+        .order_by(CarMake.name, CarModel.name)
+        .limit(limit)
+    ).all()
+    return makes, models
+
+
+# Session hook: ORM writes to makes and models update the index in the same transaction
+def _reindex_flushed(session, flush_context):
+    make_ids, model_ids = set(), set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(instance, (CarMake, CarModel)):
+            continue
+        if instance in session.dirty and not inspect(instance).attrs.name.history.has_changes():
+            continue
+        (make_ids if isinstance(instance, CarMake) else model_ids).add(instance.id)
+    reindex(session.connection(), make_ids=make_ids, model_ids=model_ids)
+
+
+def search_init_app(app):
+    if not event.contains(Session, "after_flush", _reindex_flushed):
+        event.listen(Session, "after_flush", _reindex_flushed)
@@ -0,0 +1,5 @@
+# Beat only publishes the schedule by task name, so it needs neither the tasks nor the database
+from app import create_beat_app
+
+flask_app = create_beat_app()
+celery_app = flask_app.extensions["celery"]
@@ -0,0 +1,199 @@
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from app.constants import (SYNC_EXCLUDE_KEYS, SYNC_PAGE_SIZE, SYNC_REQUEST_TIMEOUT_SECONDS, URL,
+                           DEFAULT_SYNC_FETCH_CONCURRENCY, DEFAULT_SYNC_PREFETCH_PAGES)
+
+OBJECT_ID_KEY = "objectId"
+UPDATED_AT_KEY = "updatedAt"
+RESULTS_KEY = "results"
+# Sentinel put on the page queue when the producer is finished
+_DONE = object()
+
+
+def parse_headers():
+    return {
+        'X-Parse-Application-Id': os.getenv('PARSE_APPLICATION_ID'),
+        'X-Parse-Master-Key': os.getenv('PARSE_MASTER_KEY'),
+    }
+
+
+def _parse_date(iso):
+    return {"__type": "Date", "iso": iso}
+
+
+def pooled_session(pool_size):
+    """Keep-alive session whose connection pool fits every concurrent fetch."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class CarDataFetcher:
+    """Walks the Back4App (Parse) class in objectId order, one bounded page at a time.
+
+    Pages are requested with a keyset condition (``objectId > cursor``) rather
+    than ``skip`` so every request costs the same and a run can be resumed from
+    the last objectId it committed.
+
+    With ``concurrency > 1`` a background thread fetches windows of
+    ``concurrency`` pages in parallel (``skip`` is only used inside a window, so
+    it stays bounded) and hands them over through a queue of at most
+    ``prefetch_pages`` pages. Network I/O then overlaps the caller's DB writes,
+    and a slow consumer throttles the fetcher instead of growing memory.
+    """
+
+    def __init__(self, url=URL, page_size=SYNC_PAGE_SIZE, headers=None, session=None,
+                 timeout=SYNC_REQUEST_TIMEOUT_SECONDS, concurrency=DEFAULT_SYNC_FETCH_CONCURRENCY,
+                 prefetch_pages=DEFAULT_SYNC_PREFETCH_PAGES, upto=None, updated_after=None,
+                 updated_upto=None):
+        self.url = url
+        self.page_size = page_size
+        self.headers = parse_headers() if headers is None else headers
+        self.concurrency = max(concurrency, 1)
+        self.prefetch_pages = max(prefetch_pages, 1)
+        self.session = session or pooled_session(self.concurrency)
+        self.timeout = timeout
+        # Inclusive objectId upper bound, used by chunked syncs
+        self.upto = upto
+        # updatedAt window (ISO strings), used by incremental syncs
+        self.updated_after = updated_after
+        self.updated_upto = updated_upto
+
+    def page_params(self, cursor=None, skip=0):
+        params = {
+            "limit": self.page_size,
+            "order": OBJECT_ID_KEY,
+            "excludeKeys": SYNC_EXCLUDE_KEYS,
+        }
+        where = {}
+        condition = {}
+        if cursor:
+            condition["$gt"] = cursor
+        if self.upto:
+            condition["$lte"] = self.upto
+        if condition:
+            where[OBJECT_ID_KEY] = condition
+        condition = {}
+        if self.updated_after:
+            condition["$gt"] = _parse_date(self.updated_after)
+        if self.updated_upto:
+            condition["$lte"] = _parse_date(self.updated_upto)
+        if condition:
+            where[UPDATED_AT_KEY] = condition
+        if where:
+            params["where"] = json.dumps(where)
+        if skip:
+            params["skip"] = skip
+        return params
+
+    def fetch_page(self, cursor=None, skip=0):
+        return self._get(self.page_params(cursor, skip))
+
+    def latest_updated_at(self):
+        """Return the newest ``updatedAt`` in the class, or None when it is empty."""
+        params = {"order": f"-{UPDATED_AT_KEY}", "limit": 1, "keys": UPDATED_AT_KEY}
+        results = self._get(params)
+        return results[0][UPDATED_AT_KEY] if results else None
+
+    def iter_chunks(self, chunk_size, cursor=None):
+        """Yield ``(after, upto)`` objectId ranges of ``chunk_size`` records each.
+
+        Only the boundary record of every range is requested, so enumerating
+        the whole class costs one tiny request per chunk. The last range is
+        open-ended (``upto`` is None).
+        """
+        while True:
+            params = self.page_params(cursor, skip=chunk_size - 1)
+            params.update(limit=1, keys=OBJECT_ID_KEY)
+            results = self._get(params)
+            if not results:
+                yield cursor, None
+                return
+            upto = results[0][OBJECT_ID_KEY]
+            yield cursor, upto
+            cursor = upto
+
+    def iter_pages(self, cursor=None):
+        """Yield ``(results, next_cursor)`` in objectId order until the class is exhausted."""
+        if self.concurrency == 1:
+            yield from self._iter_pages_serial(cursor)
+        else:
+            yield from self._iter_pages_concurrent(cursor)
+
+    def iter_records(self, cursor=None):
+        for results, _ in self.iter_pages(cursor):
+            yield from results
+
+    def _iter_pages_serial(self, cursor):
+        while True:
+            results = self.fetch_page(cursor)
+            if not results:
+                return
+            cursor = results[-1][OBJECT_ID_KEY]
+            yield results, cursor
+            if len(results) < self.page_size:
+                return
+
+    def _iter_pages_concurrent(self, cursor):
+        pages = queue.Queue(maxsize=self.prefetch_pages)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(cursor, pages, stop), daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Unblock the producer if the consumer stopped early
+            stop.set()
+            producer.join()
+
+    def _produce(self, cursor, pages, stop):
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                exhausted = False
+                while not exhausted and not stop.is_set():
+                    futures = [
+                        executor.submit(self.fetch_page, cursor, index * self.page_size)
+                        for index in range(self.concurrency)
+                    ]
+                    for future in futures:
+                        results = future.result() if not exhausted else None
+                        if not results:
+                            exhausted = True
+                            continue
+                        cursor = results[-1][OBJECT_ID_KEY]
+                        if not self._put(pages, (results, cursor), stop):
+                            return
+                        if len(results) < self.page_size:
+                            exhausted = True
+        except Exception as exc:
+            self._put(pages, exc, stop)
+            return
+        self._put(pages, _DONE, stop)
+
+    def _get(self, params):
+        response = self.session.get(self.url, headers=self.headers, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get(RESULTS_KEY, [])
+
+    @staticmethod
+    def _put(pages, item, stop):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
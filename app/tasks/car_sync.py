@@ -0,0 +1,346 @@
+import time
+import uuid
+from contextlib import contextmanager
+from itertools import islice
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app import db
+from app.cache import mark_tables_changed
+from app.models.car import CarMake, CarModel, CarYear
+from app.models.sync_state import SyncState
+from app.search import reindex
+from app.constants import SYNC_BATCH_SIZE, SYNC_MAX_YEAR, SYNC_MIN_YEAR
+
+# Keys of the per-table counters returned by the upserter
+INSERTED_KEY = "inserted"
+UNCHANGED_KEY = "unchanged"
+SKIPPED_KEY = "skipped"
+TABLE_KEYS = ("makes", "models", "years")
+
+# Phases of a sync run, timed separately to show where it spends its time
+PHASE_FETCH = "fetch"
+PHASE_PARSE = "parse"
+PHASE_UPSERT = "upsert"
+PHASE_COMMIT = "commit"
+SYNC_PHASES = (PHASE_FETCH, PHASE_PARSE, PHASE_UPSERT, PHASE_COMMIT)
+
+
+def _new_id():
+    return uuid.uuid4().hex
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert_ignore(model, rows):
+    """Multi-row INSERT that leaves rows colliding on a unique key untouched."""
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        # Assigning the column to itself turns the duplicate into a no-op
+        stmt = stmt.on_duplicate_key_update(id=table.c.id)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(table).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(table).on_conflict_do_nothing()
+    else:
+        stmt = table.insert()
+    # executemany: the DBAPI drivers rewrite this into multi-row VALUES batches
+    db.session.execute(stmt, rows)
+    mark_tables_changed(db.session, table.name)
+
+
+def _by_row(resolved):
+    """Group ``{pending key: stored id}`` into ``{stored id: [pending keys]}``."""
+    rows = {}
+    for key, row_id in resolved.items():
+        rows.setdefault(row_id, []).append(key)
+    return rows
+
+
+def normalize_record(item):
+    """Return (make, model, year) for a Back4App row, or None if it is filtered out."""
+    make_name = item.get("Make")
+    model_name = item.get("Model")
+    year = item.get("Year")
+    if not make_name or not model_name or year is None:
+        return None
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return None
+    if not (SYNC_MIN_YEAR <= year <= SYNC_MAX_YEAR):
+        return None
+    return make_name, model_name, year
+
+
+def get_sync_state(key):
+    state = db.session.get(SyncState, key)
+    return state.value if state else None
+
+
+def set_sync_state(key, value):
+    """Stage a sync state value; it is committed together with the caller's data."""
+    state = db.session.get(SyncState, key)
+    if state is None:
+        db.session.add(SyncState(key=key, value=value))
+    else:
+        state.value = value
+
+
+def new_stats():
+    return {table: {INSERTED_KEY: 0, UNCHANGED_KEY: 0, SKIPPED_KEY: 0} for table in TABLE_KEYS}
+
+
+def merge_stats(total, stats):
+    for table in TABLE_KEYS:
+        for key, value in stats[table].items():
+            total[table][key] += value
+    return total
+
+
+class SyncTimer:
+    """Seconds spent in every sync phase, and since the timer was created."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(SYNC_PHASES, 0.0)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def timed(self, name, iterable):
+        """Iterate ``iterable``, counting the time spent waiting for each item as ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def rounded(self):
+        return {name: round(seconds, 3) for name, seconds in self.phases.items()}
+
+
+def merge_phases(total, phases):
+    for name in SYNC_PHASES:
+        total[name] = round(total[name] + phases[name], 3)
+    return total
+
+
+class CarCatalogUpserter:
+    """Set-based upsert of Back4App rows into car_makes, car_models and car_years.
+
+    Existing rows are loaded once per table keyed by their natural key, each
+    batch is diffed in memory and only the missing rows are written with
+    multi-row inserts. The caller owns the transaction.
+    """
+
+    def __init__(self, batch_size=SYNC_BATCH_SIZE, preload=True, timer=None):
+        self.batch_size = batch_size
+        # preload=False looks up only the keys each batch references, which is
+        # cheaper for chunk tasks that touch a small slice of the catalog
+        self.preload = preload
+        self.stats = new_stats()
+        self.timer = timer or SyncTimer()
+        self._make_ids = None
+        self._model_ids = None
+        self._year_keys = None
+
+    def load(self):
+        if not self.preload:
+            self._make_ids, self._model_ids, self._year_keys = {}, {}, set()
+            return
+        self._make_ids = {
+            name: make_id
+            for make_id, name in db.session.execute(db.select(CarMake.id, CarMake.name))
+        }
+        self._model_ids = {
+            (make_id, name): model_id
+            for model_id, name, make_id in db.session.execute(
+                db.select(CarModel.id, CarModel.name, CarModel.make_id)
+            )
+        }
+        self._year_keys = set(
+            map(tuple, db.session.execute(db.select(CarYear.model_id, CarYear.year)))
+        )
+
+    def upsert(self, records):
+        """Upsert an iterable of raw rows in batches and return the running stats."""
+        if self._make_ids is None:
+            with self.timer.phase(PHASE_UPSERT):
+                self.load()
+        for chunk in _chunks(records, self.batch_size):
+            with self.timer.phase(PHASE_PARSE):
+                rows = self._parse(chunk)
+            with self.timer.phase(PHASE_UPSERT):
+                self._write(rows)
+        return self.stats
+
+    def _parse(self, chunk):
+        rows = []
+        for item in chunk:
+            row = normalize_record(item)
+            if row is None:
+                for table in TABLE_KEYS:
+                    self.stats[table][SKIPPED_KEY] += 1
+                continue
+            rows.append(row)
+        return rows
+
+    def _write(self, rows):
+        if not self.preload:
+            self._load_keys(rows)
+
+        # Makes
+        pending_makes = {}
+        for make_name, _, _ in rows:
+            if make_name in self._make_ids or make_name in pending_makes:
+                self.stats["makes"][UNCHANGED_KEY] += 1
+            else:
+                pending_makes[make_name] = _new_id()
+        self._write_makes(pending_makes)
+
+        # Models
+        pending_models = {}
+        for make_name, model_name, _ in rows:
+            key = (self._make_ids[make_name], model_name)
+            if key in self._model_ids or key in pending_models:
+                self.stats["models"][UNCHANGED_KEY] += 1
+            else:
+                pending_models[key] = _new_id()
+        self._write_models(pending_models)
+
+        # Years
+        pending_years = set()
+        for make_name, model_name, year in rows:
+            key = (self._model_ids[(self._make_ids[make_name], model_name)], year)
+            if key in self._year_keys or key in pending_years:
+                self.stats["years"][UNCHANGED_KEY] += 1
+            else:
+                pending_years.add(key)
+        _insert_ignore(
+            CarYear,
+            [{"id": _new_id(), "model_id": model_id, "year": year} for model_id, year in pending_years],
+        )
+        self._year_keys.update(pending_years)
+        self.stats["years"][INSERTED_KEY] += len(pending_years)
+
+    def _load_keys(self, rows):
+        names = {make_name for make_name, _, _ in rows} - self._make_ids.keys()
+        if names:
+            self._make_ids.update(
+                (name, make_id)
+                for make_id, name in db.session.execute(
+                    db.select(CarMake.id, CarMake.name).where(CarMake.name.in_(list(names)))
+                )
+            )
+        model_keys = {
+            (self._make_ids[make_name], model_name)
+            for make_name, model_name, _ in rows
+            if make_name in self._make_ids
+        } - self._model_ids.keys()
+        if model_keys:
+            self._model_ids.update(
+                ((make_id, name), model_id)
+                for model_id, name, make_id in db.session.execute(
+                    db.select(CarModel.id, CarModel.name, CarModel.make_id).where(
+                        tuple_(CarModel.make_id, CarModel.name).in_(list(model_keys))
+                    )
+                )
+            )
+        year_keys = {
+            (self._model_ids[(self._make_ids[make_name], model_name)], year)
+            for make_name, model_name, year in rows
+            if (self._make_ids.get(make_name), model_name) in self._model_ids
+        } - self._year_keys
+        if year_keys:
+            self._year_keys.update(
+                map(tuple, db.session.execute(
+                    db.select(CarYear.model_id, CarYear.year).where(
+                        tuple_(CarYear.model_id, CarYear.year).in_(list(year_keys))
+                    )
+                ))
+            )
+
+    def _write_makes(self, pending):
+        if not pending:
+            return
+        _insert_ignore(CarMake, [{"id": make_id, "name": name} for name, make_id in pending.items()])
+        # Re-read the ids: a concurrent sync may have inserted the same make first.
+        # A locking read sees its committed row, which a REPEATABLE READ snapshot would not.
+        resolved = {
+            name: make_id
+            for make_id, name in db.session.execute(
+                db.select(CarMake.id, CarMake.name).where(CarMake.name.in_(list(pending))).with_for_update(read=True)
+            )
+            if name in pending
+        }
+        # A name the insert ignored because it collides with another spelling under the
+        # column collation (case, accents) is looked up on its own, by the database's rules
+        for name in pending.keys() - resolved.keys():
+            resolved[name] = db.session.execute(
+                db.select(CarMake.id).where(CarMake.name == name).with_for_update(read=True)
+            ).scalar_one()
+        inserted = []
+        for make_id, names in _by_row(resolved).items():
+            if any(make_id == pending[name] for name in names):
+                self.stats["makes"][INSERTED_KEY] += 1
+                inserted.append(make_id)
+            else:
+                self.stats["makes"][UNCHANGED_KEY] += 1
+        self._make_ids.update(resolved)
+        # Only rows this batch inserted are new to the search index
+        reindex(db.session.connection(), make_ids=inserted)
+
+    def _write_models(self, pending):
+        if not pending:
+            return
+        _insert_ignore(
+            CarModel,
+            [{"id": model_id, "make_id": make_id, "name": name} for (make_id, name), model_id in pending.items()],
+        )
+        resolved = {
+            (make_id, name): model_id
+            for model_id, name, make_id in db.session.execute(
+                db.select(CarModel.id, CarModel.name, CarModel.make_id).where(
+                    tuple_(CarModel.make_id, CarModel.name).in_(list(pending))
+                ).with_for_update(read=True)
+            )
+            if (make_id, name) in pending
+        }
+        for make_id, name in pending.keys() - resolved.keys():
+            resolved[(make_id, name)] = db.session.execute(
+                db.select(CarModel.id)
+                .where(CarModel.make_id == make_id, CarModel.name == name)
+                .with_for_update(read=True)
+            ).scalar_one()
+        inserted = []
+        for model_id, keys in _by_row(resolved).items():
+            if any(model_id == pending[key] for key in keys):
+                self.stats["models"][INSERTED_KEY] += 1
+                inserted.append(model_id)
+            else:
+                self.stats["models"][UNCHANGED_KEY] += 1
+        self._model_ids.update(resolved)
+        reindex(db.session.connection(), model_ids=inserted)
@@ -1,59 +1,274 @@
-import os
+import time
+from contextlib import contextmanager
 import requests
+from celery import chord
+from flask import current_app
+from sqlalchemy.exc import DBAPIError, OperationalError
 from app import db
-from app.models.car import CarMake, CarModel, CarYear
-from app.constants import URL
+from app.constants import (SYNC_CURSOR_STATE_KEY,SYNC_SNAPSHOT_STATE_KEY,SYNC_WATERMARK_STATE_KEY,SYNC_MODE_FULL,SYNC_MODE_INCREMENTAL,SYNC_MAX_RETRIES,SYNC_RETRY_BACKOFF_SECONDS,SYNC_RETRY_BACKOFF_MAX_SECONDS,SYNC_PROGRESS_INTERVAL_SECONDS)
 from celery.utils.log import get_task_logger
 from app.tasks.celery_app import celery_app
+from app.tasks.car_fetcher import CarDataFetcher
+from app.tasks.car_sync import (PHASE_COMMIT,PHASE_FETCH,SYNC_PHASES,CarCatalogUpserter,SyncTimer,get_sync_state,merge_phases,merge_stats,new_stats,set_sync_state)
 
 logger = get_task_logger(__name__)
 
-@celery_app.task(name="data_sync_task")
-def carDataSync():
-    headers = {'X-Parse-Application-Id': os.getenv('PARSE_APPLICATION_ID'),'X-Parse-Master-Key': os.getenv('PARSE_MASTER_KEY')}
-    
+# Keys of the chunk and summary results
+STATUS_KEY = "status"
+RECORDS_KEY = "records"
+STATS_KEY = "stats"
+PHASES_KEY = "phases"
+WINDOW_KEY = "window"
+CHUNKS_KEY = "chunks"
+
+# Summary statuses
+SYNC_STATUS_SYNCED = "synced"
+SYNC_STATUS_UP_TO_DATE = "up_to_date"
+SYNC_STATUS_DISPATCHED = "dispatched"
+
+# MySQL errors worth retrying: server gone away, lost connection, lock wait timeout, deadlock
+TRANSIENT_MYSQL_ERRORS = (2006, 2013, 1205, 1213)
+
+# Custom task state while a sync runs; its meta is the summary so far
+SYNC_PROGRESS_STATE = "PROGRESS"
+
+
+class TransientSyncError(Exception):
+    """A sync step failed for a reason that may go away: network, 429/5xx, lost connection, deadlock."""
+
+
+# Transient failures are retried with exponential backoff; anything else fails the task.
+# Inline syncs resume from their saved cursor and chunks are idempotent, so a retry is safe.
+SYNC_RETRY_OPTIONS = {
+    "bind": True,
+    "autoretry_for": (TransientSyncError,),
+    "max_retries": SYNC_MAX_RETRIES,
+    "retry_backoff": SYNC_RETRY_BACKOFF_SECONDS,
+    "retry_backoff_max": SYNC_RETRY_BACKOFF_MAX_SECONDS,
+    "retry_jitter": True,
+}
+
+
+def _is_transient(exc):
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status == 429 or status >= 500
+    if not isinstance(exc, DBAPIError):
+        return False
+    if exc.connection_invalidated:
+        return True
+    # Schema errors such as an unknown column are OperationalErrors too, so go by the MySQL error code
+    code = exc.orig.args[0] if isinstance(exc, OperationalError) and exc.orig is not None and exc.orig.args else None
+    return code in TRANSIENT_MYSQL_ERRORS
+
+
+@contextmanager
+def _failing(description):
+    """Roll back on any error and raise it again, as TransientSyncError when worth retrying."""
     try:
-        response = requests.get(URL, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("results", [])
-        
-        synced_count = 0
-        for item in results:
-            year = item.get("Year")
-            make_name = item.get("Make")
-            model_name = item.get("Model")
-            
-            # Data Filtering
-            if not year or not (2012 <= int(year) <= 2022):
-                continue
-                
-            # Upsert CarMake
-            make = db.session.execute(db.select(CarMake).filter_by(name=make_name)).scalar()
-            if not make:
-                make = CarMake(name=make_name)
-                db.session.add(make)
-                db.session.flush()  # To get make.id
-            
-            # Upsert CarModel
-            model = db.session.execute(db.select(CarModel).filter_by(name=model_name, make_id=make.id)).scalar()
-            if not model:
-                model = CarModel(name=model_name, make_id=make.id)
-                db.session.add(model)
-                db.session.flush()  # To get model.id
-                
-            # Upsert CarYear
-            car_year = db.session.execute(db.select(CarYear).filter_by(year=int(year), model_id=model.id)).scalar()
-            if not car_year:
-                car_year = CarYear(year=int(year), model_id=model.id)
-                db.session.add(car_year)
-            
-            synced_count += 1
-            
-        db.session.commit()
-        logger.info(f"Synced {synced_count} records.")    
-        
+        yield
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error during sync: {str(e)}")
-        return f"Error during sync: {str(e)}"
+        if _is_transient(e):
+            logger.warning(f"{description} failed, will retry: {str(e)}")
+            raise TransientSyncError(f"{description} failed: {str(e)}") from e
+        logger.error(f"{description} failed: {str(e)}")
+        raise
+
+
+def _summary(status, records, stats, phases, elapsed, **extra):
+    return {
+        STATUS_KEY: status,
+        RECORDS_KEY: records,
+        STATS_KEY: stats,
+        PHASES_KEY: phases,
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(records / elapsed, 1) if elapsed else 0.0,
+        **extra,
+    }
+
+
+def _describe(summary):
+    phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in summary[PHASES_KEY].items())
+    return (f"Synced {summary[RECORDS_KEY]} records in {summary['elapsed_seconds']:.1f}s "
+            f"({summary['records_per_second']:.0f}/s; {phases}): {summary[STATS_KEY]}")
+
+
+class SyncProgress:
+    """Publishes the running totals of a bound task as its PROGRESS state, at most every few seconds."""
+
+    def __init__(self, task, timer, interval=SYNC_PROGRESS_INTERVAL_SECONDS):
+        self.task = task
+        self.timer = timer
+        self.interval = interval
+        self._published = 0.0
+
+    def report(self, records, stats, **extra):
+        now = time.monotonic()
+        if now - self._published < self.interval:
+            return
+        self._published = now
+        request = self.task.request
+        if request.id is None or request.called_directly or request.is_eager:
+            return
+        meta = _summary(SYNC_PROGRESS_STATE, records, stats, self.timer.rounded(), self.timer.elapsed, **extra)
+        self.task.update_state(state=SYNC_PROGRESS_STATE, meta=meta)
+
+
+def _fetcher(**kwargs):
+    return CarDataFetcher(
+        concurrency=current_app.config["SYNC_FETCH_CONCURRENCY"],
+        prefetch_pages=current_app.config["SYNC_PREFETCH_PAGES"],
+        **kwargs,
+    )
+
+
+@celery_app.task(name="data_sync_task", **SYNC_RETRY_OPTIONS)
+def carDataSync(self, mode=None):
+    """Sync the car catalog from Back4App.
+
+    ``mode="incremental"`` only requests records whose ``updatedAt`` is newer
+    than the stored watermark; ``mode="full"`` re-scans every record and
+    upserts whatever the incremental runs missed. Neither mode deletes rows
+    that were removed upstream: the catalog also holds rows created through
+    the API, which Back4App does not know about. Without a mode the sync is
+    incremental once a watermark exists.
+    """
+    if current_app.config["SYNC_FANOUT"]:
+        return _dispatch_chunks(mode)
+    return _sync_inline(self, mode)
+
+
+def _sync_window(mode, snapshot=None):
+    """Return the ``(updated_after, updated_upto)`` window to sync, or None if nothing changed.
+
+    The upper bound is the newest ``updatedAt`` when the run starts; records
+    changed while the sync is running are picked up by the next run.
+    """
+    watermark = get_sync_state(SYNC_WATERMARK_STATE_KEY)
+    if mode is None:
+        mode = SYNC_MODE_INCREMENTAL if watermark else SYNC_MODE_FULL
+    if mode == SYNC_MODE_FULL:
+        watermark = None
+    if snapshot is None:
+        snapshot = _fetcher().latest_updated_at()
+    if snapshot is None or (watermark and snapshot <= watermark):
+        return None
+    logger.info(f"Starting {mode} sync of records updated in ({watermark}, {snapshot}]")
+    return watermark, snapshot
+
+
+def _dispatch_chunks(mode):
+    """Split the catalog into objectId ranges and sync them on all workers."""
+    timer = SyncTimer()
+    with _failing("Sync dispatch"), timer.phase(PHASE_FETCH):
+        window = _sync_window(mode)
+        if window is None:
+            logger.info("Car catalog is up to date")
+            return _summary(SYNC_STATUS_UP_TO_DATE, 0, new_stats(), timer.rounded(), timer.elapsed, **{CHUNKS_KEY: 0})
+        updated_after, updated_upto = window
+        fetcher = _fetcher(updated_after=updated_after, updated_upto=updated_upto)
+        ranges = list(fetcher.iter_chunks(current_app.config["SYNC_CHUNK_SIZE"]))
+
+    header = [carDataSyncChunk.s(after, upto, updated_after, updated_upto) for after, upto in ranges]
+    summary = chord(header)(carDataSyncSummary.s(watermark=updated_upto, started_at=time.time()))
+    logger.info(f"Dispatched {len(header)} sync chunks, summary task {summary.id}")
+    return _summary(SYNC_STATUS_DISPATCHED, 0, new_stats(), timer.rounded(), timer.elapsed,
+                    **{CHUNKS_KEY: len(header), WINDOW_KEY: window, "summary_id": summary.id})
+
+
+def _sync_inline(task, mode):
+    """Sync the whole catalog in this worker, resuming from the saved cursor."""
+    timer = SyncTimer()
+    progress = SyncProgress(task, timer)
+    with _failing("Sync"):
+        # Resume after the last committed page, within the same window, if a previous run crashed
+        cursor = get_sync_state(SYNC_CURSOR_STATE_KEY)
+        snapshot = None
+        if cursor:
+            snapshot = get_sync_state(SYNC_SNAPSHOT_STATE_KEY)
+            logger.info(f"Resuming sync after objectId {cursor}")
+
+        with timer.phase(PHASE_FETCH):
+            window = _sync_window(mode, snapshot)
+        if window is None:
+            logger.info("Car catalog is up to date")
+            return _summary(SYNC_STATUS_UP_TO_DATE, 0, new_stats(), timer.rounded(), timer.elapsed)
+        updated_after, updated_upto = window
+        set_sync_state(SYNC_SNAPSHOT_STATE_KEY, updated_upto)
+
+        fetcher = _fetcher(updated_after=updated_after, updated_upto=updated_upto)
+        upserter = CarCatalogUpserter(timer=timer)
+        synced_count = 0
+        for results, cursor in timer.timed(PHASE_FETCH, fetcher.iter_pages(cursor)):
+            # Pages arrive in objectId order while later ones are still being fetched;
+            # each page commits with its cursor so memory and lock time stay flat
+            upserter.upsert(results)
+            set_sync_state(SYNC_CURSOR_STATE_KEY, cursor)
+            with timer.phase(PHASE_COMMIT):
+                db.session.commit()
+            synced_count += len(results)
+            progress.report(synced_count, upserter.stats, **{WINDOW_KEY: window})
+
+        set_sync_state(SYNC_CURSOR_STATE_KEY, None)
+        set_sync_state(SYNC_SNAPSHOT_STATE_KEY, None)
+        set_sync_state(SYNC_WATERMARK_STATE_KEY, updated_upto)
+        with timer.phase(PHASE_COMMIT):
+            db.session.commit()
+
+    summary = _summary(SYNC_STATUS_SYNCED, synced_count, upserter.stats, timer.rounded(), timer.elapsed,
+                       **{WINDOW_KEY: window})
+    logger.info(_describe(summary))
+    return summary
+
+
+@celery_app.task(name="data_sync_chunk_task", **SYNC_RETRY_OPTIONS)
+def carDataSyncChunk(self, after, upto, updated_after=None, updated_upto=None):
+    """Sync the records with ``after < objectId <= upto``, committing page by page.
+
+    Inserts ignore rows that already exist, so a chunk can be re-run safely
+    after a partial run, and no transaction holds its locks across fetches.
+    """
+    timer = SyncTimer()
+    progress = SyncProgress(self, timer)
+    with _failing(f"Sync of chunk ({after}, {upto}]"):
+        fetcher = _fetcher(upto=upto, updated_after=updated_after, updated_upto=updated_upto)
+        upserter = CarCatalogUpserter(preload=False, timer=timer)
+        synced_count = 0
+        for results, _ in timer.timed(PHASE_FETCH, fetcher.iter_pages(after)):
+            upserter.upsert(results)
+            with timer.phase(PHASE_COMMIT):
+                db.session.commit()
+            synced_count += len(results)
+            progress.report(synced_count, upserter.stats)
+    return _summary(SYNC_STATUS_SYNCED, synced_count, upserter.stats, timer.rounded(), timer.elapsed)
+
+
+@celery_app.task(name="data_sync_summary_task", **SYNC_RETRY_OPTIONS)
+def carDataSyncSummary(self, chunk_results, watermark=None, started_at=None):
+    """Aggregate the chunk results once every chunk committed and advance the watermark.
+
+    A chunk that still fails after its retries fails the chord, so this task
+    never runs and the watermark stays where it was.
+    """
+    stats = new_stats()
+    phases = dict.fromkeys(SYNC_PHASES, 0.0)
+    synced_count = 0
+    for result in chunk_results:
+        merge_stats(stats, result[STATS_KEY])
+        merge_phases(phases, result[PHASES_KEY])
+        synced_count += result[RECORDS_KEY]
+
+    if watermark:
+        with _failing("Sync watermark update"):
+            set_sync_state(SYNC_WATERMARK_STATE_KEY, watermark)
+            db.session.commit()
+
+    # Phases add up the time of all chunks; elapsed is wall-clock time since dispatch
+    elapsed = time.time() - started_at if started_at else sum(phases.values())
+    summary = _summary(SYNC_STATUS_SYNCED, synced_count, stats, phases, elapsed,
+                       **{CHUNKS_KEY: len(chunk_results)})
+    logger.info(_describe(summary))
+    return summary
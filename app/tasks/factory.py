@@ -0,0 +1,48 @@
+import os
+from celery import Celery, Task
+from celery.schedules import crontab
+from celery.signals import worker_process_init
+from datetime import timedelta
+from app.constants import SYNC_FULL_DAYS, SYNC_INCREMENTAL_DAYS, SYNC_MODE_FULL, SYNC_SCHEDULE_HOUR
+from app.query_detector import query_detector
+
+
+def celery_init_app(app) -> Celery:
+    class FlaskTask(Task):
+        def __call__(self, *args: object, **kwargs: object) -> object:
+            with app.app_context(), query_detector.scope(f"task {self.name}"):
+                return self.run(*args, **kwargs)
+
+    celery_app = Celery(app.name, task_cls=FlaskTask,)
+    celery_app.conf.update(
+        broker_url=os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0"),
+        result_backend=os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0"),
+        beat_schedule={
+            "daily-data-sync": {
+                "task": "data_sync_task",
+                # Daily, except on the day the full re-scan runs in its place
+                "schedule": crontab(minute=0, hour=SYNC_SCHEDULE_HOUR, day_of_week=SYNC_INCREMENTAL_DAYS),
+            },
+            "weekly-full-data-sync": {
+                "task": "data_sync_task",
+                "schedule": crontab(minute=0, hour=SYNC_SCHEDULE_HOUR, day_of_week=SYNC_FULL_DAYS),
+                "kwargs": {"mode": SYNC_MODE_FULL},
+            },
+            "flush-last-logins": {
+                "task": "flush_last_logins_task",
+                "schedule": timedelta(seconds=app.config["LAST_LOGIN_FLUSH_SECONDS"]),
+            },
+        },
+        task_ignore_result=False,
+    )
+    celery_app.set_default()
+    app.extensions["celery"] = celery_app
+
+    @worker_process_init.connect(weak=False)
+    def reset_engine(**kwargs):
+        # Forked pool processes must not share the parent's pooled connections
+        from app import db
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+    return celery_app
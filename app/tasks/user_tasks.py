@@ -0,0 +1,12 @@
+from celery.utils.log import get_task_logger
+from app.tasks.celery_app import celery_app
+from app.routes.auth.last_login import last_login_buffer
+
+logger = get_task_logger(__name__)
+
+@celery_app.task(name="flush_last_logins_task")
+def flushLastLogins():
+    flushed = last_login_buffer.flush()
+    if flushed:
+        logger.info(f"Flushed last login time of {flushed} users.")
+    return flushed
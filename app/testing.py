@@ -0,0 +1,67 @@
+"""Query count assertions for tests.
+
+    from app.testing import assert_max_queries
+
+    def test_list_makes(client, auth_headers):
+        with assert_max_queries(client.application, 3):
+            client.get("/cars/makes", headers=auth_headers)
+
+Add ``pytest_plugins = ["app.testing"]`` to a conftest to also get the
+``query_counter`` fixture.
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+from app.query_detector import statement_shape
+
+
+class QueryCounter:
+    """Statements executed on an app's engine while counting."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement_shape(statement))
+
+    @contextmanager
+    def count(self, app):
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "after_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(engine, "after_cursor_execute", self._record)
+
+
+@contextmanager
+def assert_max_queries(app, limit):
+    """Fail when the block executes more than ``limit`` SQL statements on ``app``'s database."""
+    counter = QueryCounter()
+    with counter.count(app):
+        yield counter
+    if len(counter) > limit:
+        listing = "\n".join(f"  {index}. {statement}" for index, statement in enumerate(counter.statements, start=1))
+        raise AssertionError(f"{len(counter)} queries executed, expected at most {limit}:\n{listing}")
+
+
+def assert_endpoint_queries(client, limit, path, method="GET", **kwargs):
+    """Request ``path`` with the Flask test ``client`` and fail above ``limit`` queries; returns the response."""
+    with assert_max_queries(client.application, limit):
+        return client.open(path, method=method, **kwargs)
+
+
+try:
+    import pytest
+except ImportError:  # pytest is only installed for tests
+    pytest = None
+
+if pytest is not None:
+    @pytest.fixture
+    def query_counter():
+        """A fresh ``QueryCounter``; use ``with query_counter.count(app):``."""
+        return QueryCounter()
@@ -0,0 +1,104 @@
+"""Local stand-in for the Back4App Car_Model_List class, used by the benchmarks."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAKES = 50
+MODELS = 2000
+FIRST_YEAR = 2012
+YEARS = 11
+
+
+def make_records(count):
+    return [
+        {
+            "objectId": f"{index:010d}",
+            "Make": f"Make {index % MAKES}",
+            "Model": f"Model {index % MODELS}",
+            "Year": FIRST_YEAR + index % YEARS,
+            "updatedAt": "2024-01-01T00:00:00.000Z",
+        }
+        for index in range(count)
+    ]
+
+
+def _matches(record, where):
+    for key, condition in where.items():
+        value = record.get(key)
+        if isinstance(condition, dict):
+            for op, operand in condition.items():
+                if isinstance(operand, dict) and "iso" in operand:
+                    operand = operand["iso"]
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeParseAPI:
+    """Serves ``records`` with Parse-style limit/skip/order/where/count handling."""
+
+    def __init__(self, records, latency=0.0, host="127.0.0.1", port=0):
+        self.records = records
+        self.latency = latency
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                api.requests += 1
+                if api.latency:
+                    time.sleep(api.latency)
+                body = json.dumps(api.query(parse_qs(urlparse(self.path).query))).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.requests = 0
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/classes/Car_Model_List"
+
+    def query(self, params):
+        rows = self.records
+        if "where" in params:
+            where = json.loads(params["where"][0])
+            rows = [row for row in rows if _matches(row, where)]
+        if "order" in params:
+            for key in reversed(params["order"][0].split(",")):
+                descending = key.startswith("-")
+                rows = sorted(rows, key=lambda row: row[key.lstrip("-")], reverse=descending)
+        payload = {}
+        if params.get("count", ["0"])[0] == "1":
+            payload["count"] = len(rows)
+        skip = int(params.get("skip", ["0"])[0])
+        limit = int(params.get("limit", ["100"])[0])
+        payload["results"] = rows[skip:skip + limit]
+        return payload
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,128 @@
+"""Throughput of GET /cars/makes under concurrent clients: flask's development server vs. gunicorn.
+
+    python -m benchmarks.load_test --concurrency 32 --duration 10
+    python -m benchmarks.load_test --url http://localhost:5000 --concurrency 64
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import requests
+
+PATH = "/cars/makes?per_page=20"
+PASSWORD = "LoadTest!Passw0rd"
+
+
+def token(url):
+    """Sign up a throwaway user and return its bearer token."""
+    response = requests.post(f"{url}/auth/signup", json={"email": f"{uuid.uuid4().hex}@load.test", "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def load(url, concurrency, duration):
+    """Hammer ``url + PATH`` from ``concurrency`` keep-alive clients; returns (requests/s, latencies ms, errors)."""
+    headers = {"Authorization": f"Bearer {token(url)}"}
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        timings, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = session.get(url + PATH, headers=headers, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                timings.append((time.perf_counter() - start) * 1000)
+            else:
+                failed += 1
+        with lock:
+            latencies.extend(timings)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / duration, latencies, errors[0]
+
+
+def report(name, result):
+    rate, latencies, errors = result
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    print(f"{name:<10} {rate:>9.0f} {percentiles[49]:>8.1f} {percentiles[94]:>8.1f} {percentiles[98]:>8.1f} {errors:>7}")
+
+
+def seed(env, makes):
+    code = (
+        "from app import create_app, db\n"
+        "from app.models import CarMake\n"
+        "app = create_app()\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+        f"    db.session.add_all(CarMake(name=f'Make {{index}}') for index in range({makes}))\n"
+        "    db.session.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def serve(command, url, env):
+    """Start a server and wait until it answers."""
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{command[2]} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="test a running server instead of starting both")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per server")
+    parser.add_argument("--makes", type=int, default=200, help="car makes to create in the local database")
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    print(f"{'server':<10} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    if args.url:
+        report("target", load(args.url.rstrip("/"), args.concurrency, args.duration))
+        return
+
+    env = dict(
+        os.environ,
+        DATABASE_URI=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test.db')}",
+        PORT=str(args.port),
+        PYTHONPATH=os.getcwd(),
+    )
+    seed(env, args.makes)
+    url = f"http://127.0.0.1:{args.port}"
+    servers = {
+        "flask run": [sys.executable, "-m", "flask", "--app", "app:create_app", "run", "--port", str(args.port)],
+        "gunicorn": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"],
+    }
+    for name, command in servers.items():
+        process = serve(command, url, env)
+        try:
+            report(name, load(url, args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Typeahead latency: the car_search_terms prefix index vs. a LIKE '%...%' scan.
+
+    python -m benchmarks.name_search --makes 200 --models-per-make 250
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+from sqlalchemy import and_, or_, select
+
+QUERIES = ["to", "toy cor", "land rov", "se", "m3", "zzz"]
+
+
+def measure(search, repeat):
+    search()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        search()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def random_name(rng):
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))).capitalize()
+        for _ in range(rng.randint(1, 3))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--makes", type=int, default=200)
+    parser.add_argument("--models-per-make", type=int, default=250)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "name_search.db")
+    os.environ["DATABASE_URI"] = f"sqlite:///{path}"
+    from app import create_app, db
+    from app.models import CarMake, CarModel
+    from app.search import reindex, search_names, words
+
+    rng = random.Random(7)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        makes = [{"id": f"{index:032x}", "name": f"{random_name(rng)} {index}"} for index in range(args.makes)]
+        makes[:2] = [{"id": makes[0]["id"], "name": "Toyota"}, {"id": makes[1]["id"], "name": "Land Rover"}]
+        models = [
+            {"make_id": make["id"], "name": f"{random_name(rng)} {index}"}
+            for make in makes for index in range(args.models_per_make)
+        ]
+        for index, model in enumerate(models, start=len(makes)):
+            model["id"] = f"{index:032x}"
+        models[0]["name"] = "Corolla"
+        models[args.models_per_make]["name"] = "Range Rover"
+        db.session.execute(CarMake.__table__.insert(), makes)
+        db.session.execute(CarModel.__table__.insert(), models)
+        start = time.perf_counter()
+        reindex(db.session.connection(), make_ids=[make["id"] for make in makes])
+        db.session.commit()
+        print(f"{len(makes)} makes, {len(models)} models indexed in {time.perf_counter() - start:.2f}s\n")
+
+        def like_scan(query):
+            conditions = [
+                or_(CarMake.name.ilike(f"%{word}%"), CarModel.name.ilike(f"%{word}%"))
+                for word in words(query)
+            ]
+            return db.session.execute(
+                select(CarModel.id, CarModel.name, CarModel.make_id, CarMake.name)
+                .join(CarMake, CarMake.id == CarModel.make_id)
+                .where(and_(*conditions))
+                .order_by(CarMake.name, CarModel.name)
+                .limit(args.limit)
+            ).all()
+
+        print(f"{'query':<12} {'index ms':>9} {'LIKE ms':>9} {'speedup':>8}")
+        for query in QUERIES:
+            indexed = measure(lambda: search_names(db.session, query, args.limit), args.repeat)
+            scanned = measure(lambda: like_scan(query), args.repeat)
+            print(f"{query!r:<12} {indexed:>9.2f} {scanned:>9.2f} {scanned / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Login (password verification) throughput per hash cost, inline vs. process pool.
+
+    python -m benchmarks.password_hashing --threads 8 --seconds 3
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from werkzeug.security import generate_password_hash
+from app.routes.auth.passwords import PasswordHasher
+
+PASSWORD = "Passw0rd!"
+METHODS = ["scrypt:8192:8:1", "scrypt:16384:8:1", "scrypt:32768:8:1", "pbkdf2:sha256:600000"]
+
+
+def measure(hasher, pwhash, threads, seconds):
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        done = 0
+        while time.perf_counter() < deadline:
+            hasher.verify(pwhash, PASSWORD)
+            done += 1
+        return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        logins = sum(executor.map(lambda _: client(), range(threads)))
+    return logins / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8, help="concurrent login requests")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--methods", nargs="+", default=METHODS)
+    args = parser.parse_args()
+
+    print(f"{'method':<24} {'inline/s':>10} {'pool/s':>10}   (threads={args.threads}, workers={args.workers})")
+    for method in args.methods:
+        pwhash = generate_password_hash(PASSWORD, method)
+        rates = []
+        for workers in (0, args.workers):
+            hasher = PasswordHasher()
+            hasher.init_app(SimpleNamespace(config={
+                "PASSWORD_HASH_METHOD": method,
+                "PASSWORD_HASH_WORKERS": workers,
+                "PASSWORD_HASH_MAX_PENDING": args.threads,
+                "PASSWORD_HASH_TIMEOUT_SECONDS": 60,
+            }))
+            hasher.verify(pwhash, PASSWORD)  # warm up the pool
+            rates.append(measure(hasher, pwhash, args.threads, args.seconds))
+            hasher.shutdown()
+        print(f"{method:<24} {rates[0]:>10.1f} {rates[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
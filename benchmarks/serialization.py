@@ -0,0 +1,71 @@
+"""Time to render one list page: ORM rows + marshmallow vs. column rows + FlatSerializer.
+
+    python -m benchmarks.serialization --rows 5000 --per-page 10 100 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+from flask import jsonify
+
+
+def measure(render, repeat):
+    render()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="car_models rows to create")
+    parser.add_argument("--per-page", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "serialization.db")
+    os.environ["DATABASE_URI"] = f"sqlite:///{path}"
+    from app import create_app, db
+    from app.models import CarMake, CarModel
+    from app.routes.car.apis import model_serializer
+    from app.routes.car.pagination import paginate_query
+    from app.routes.car.schemas import CarModelOutputSchema, CarModelQuerySchema, genericPaginatedSchema
+    from app.routes.car.serializers import paginated_response
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        make = CarMake(name="Benchmark")
+        db.session.add(make)
+        db.session.flush()
+        db.session.execute(CarModel.__table__.insert(), [
+            {"id": f"{index:032x}", "name": f"Model {index}", "make_id": make.id}
+            for index in range(args.rows)
+        ])
+        db.session.commit()
+
+    schema = genericPaginatedSchema(CarModelOutputSchema)()
+    print(f"{'per_page':>8} {'marshmallow ms':>15} {'fast path ms':>13} {'speedup':>8}")
+    for per_page in args.per_page:
+        with app.test_request_context():
+            # Loaded like the endpoint's query string, so only servable page sizes run
+            query_data = CarModelQuerySchema().load({"per_page": per_page, "count": "exact"})
+
+            def marshmallow_path():
+                result = paginate_query(db.session.query(CarModel), CarModel.id, query_data)
+                return jsonify(schema.dump(result))
+
+            def fast_path():
+                result = paginate_query(db.session.query(*model_serializer.columns), CarModel.id, query_data)
+                return paginated_response(result, model_serializer)
+
+            assert marshmallow_path().data == fast_path().data
+            slow = measure(marshmallow_path, args.repeat)
+            fast = measure(fast_path, args.repeat)
+            db.session.remove()
+        print(f"{per_page:>8} {slow:>15.2f} {fast:>13.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold start time of every process role, each measured in a fresh interpreter.
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --importtime web --top 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# What each process runs at startup (see scripts/*.sh)
+ROLES = {
+    "web": "from app import create_app; create_app()",
+    "worker": "import app.tasks.celery_app",
+    "beat": "import app.tasks.beat",
+    "migrate": "from app import create_migrate_app; create_migrate_app()",
+}
+HEAVY_PACKAGES = ("apiflask", "celery", "alembic", "marshmallow")
+
+TIMED = """
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in sys.argv[2:] if name in sys.modules))
+"""
+
+
+def run(args, env):
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def startup(code, env):
+    """Seconds to run ``code`` in a new interpreter, and the heavy packages it imported."""
+    output = run(["-c", TIMED, code, *HEAVY_PACKAGES], env).stdout.split()
+    return float(output[0]), output[1] if len(output) > 1 else "-"
+
+
+def importtime(code, env, top):
+    """The ``top`` modules with the highest cumulative ``-X importtime``, as (self, cumulative, name)."""
+    rows = []
+    for line in run(["-X", "importtime", "-c", code], env).stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        self_us, cumulative_us = int(fields[0].split(":")[1]), int(fields[1])
+        rows.append((self_us, cumulative_us, fields[2].rstrip()))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--importtime", choices=ROLES, help="print the import time report of one role instead")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        DATABASE_URI=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}",
+        PASSWORD_HASH_WORKERS="0",
+        PYTHONPATH=os.getcwd(),
+    )
+    if args.importtime:
+        print(f"{'self ms':>8} {'cumulative ms':>14}  module")
+        for self_us, cumulative_us, name in importtime(ROLES[args.importtime], env, args.top):
+            print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>14.1f}  {name}")
+        return
+
+    print(f"{'role':<8} {'median ms':>10} {'min ms':>8}  heavy imports")
+    for role, code in ROLES.items():
+        timings = []
+        for _ in range(args.repeat):
+            seconds, loaded = startup(code, env)
+            timings.append(seconds * 1000)
+        print(f"{role:<8} {statistics.median(timings):>10.0f} {min(timings):>8.0f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Wall-clock time of CarDataFetcher against a fake Parse API with injected latency.
+
+    python -m benchmarks.sync_fetch --records 20000 --latency 0.05
+"""
+import argparse
+import time
+from app.tasks.car_fetcher import CarDataFetcher
+from benchmarks.fake_parse_api import FakeParseAPI, make_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every API call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with FakeParseAPI(make_records(args.records), latency=args.latency) as api:
+        baseline = None
+        for concurrency in args.concurrency:
+            fetcher = CarDataFetcher(url=api.url, page_size=args.page_size, headers={},
+                                     concurrency=concurrency)
+            start = time.perf_counter()
+            fetched = sum(len(results) for results, _ in fetcher.iter_pages())
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"concurrency={concurrency:<3} records={fetched:<8} "
+                  f"{elapsed:7.2f}s  speedup={baseline / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Gunicorn settings of the production web server; every value can be overridden from the environment.
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+
+def _int_env(name, default):
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def _bool_env(name, default):
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+bind = f"0.0.0.0:{_int_env('PORT', 5000)}"
+
+# One process per core (at least two, so one keeps serving while the other is recycled);
+# threads overlap the time requests spend waiting on MySQL and Redis
+workers = _int_env("WEB_CONCURRENCY", max(multiprocessing.cpu_count(), 2))
+# The app sizes its per-process pools (e.g. password hashing) by the number of workers
+os.environ.setdefault("WEB_CONCURRENCY", str(workers))
+threads = _int_env("GUNICORN_THREADS", 4)
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+
+# Restart workers after a (jittered) number of requests so slow leaks cannot build up,
+# without every worker restarting at the same moment
+max_requests = _int_env("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _int_env("GUNICORN_MAX_REQUESTS_JITTER", 200)
+
+timeout = _int_env("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _int_env("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _int_env("GUNICORN_KEEPALIVE", 5)
+
+# Import the app once in the master; workers share its memory copy-on-write and start instantly
+preload_app = _bool_env("GUNICORN_PRELOAD", True)
+
+# Workers write their Prometheus metrics here so /metrics can add up every process;
+# it must exist before the app is (pre)loaded and is emptied when the server starts
+prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus"))
+os.makedirs(prometheus_dir, exist_ok=True)
+
+# Set to "-" to log every request to stdout
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")
+errorlog = "-"
+
+
+def on_starting(server):
+    # Numbers left by a previous run would be added to the new ones
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir)
+
+
+def post_fork(server, worker):
+    # A preloaded engine was created in the master; each worker needs its own connections
+    if server.cfg.preload_app:
+        from app import db
+        with worker.app.wsgi().app_context():
+            db.engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Recycled workers write their buffered last logins instead of dropping them
+    from app.routes.auth.last_login import last_login_buffer
+    app = getattr(worker, "wsgi", None)
+    if app is None:
+        return  # never finished booting
+    with app.app_context():
+        last_login_buffer.flush()
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a worker that exited; its counters keep adding up
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,2 +1,2 @@
 #!/bin/bash
-celery -A  app.tasks.celery_app.celery_app beat --loglevel INFO
+celery -A app.tasks.beat.celery_app beat --loglevel INFO
@@ -9,6 +9,10 @@ echo "Database is up!"
 
 echo "Starting entrypoint script..."
 
-flask db upgrade
+flask --app app:create_migrate_app db upgrade
 
-python3 -m flask --app app:create_app run --host=0.0.0.0
+# The development server runs a single process; anything else is served by gunicorn
+if [ "$FLASK_ENV" = "development" ]; then
+  exec python3 -m flask --app app:create_app run --host=0.0.0.0
+fi
+exec gunicorn -c gunicorn.conf.py "app:create_app()"
@@ -0,0 +1,111 @@
+"""Fixtures shared by the tests: one web app on a throwaway SQLite database.
+
+The schema is recreated before every test. Redis is off unless a test asks
+for ``shared_cache``, which puts an in-memory fakeredis behind the cache.
+"""
+import os
+import tempfile
+import unicodedata
+
+_DATABASE_DIR = tempfile.mkdtemp(prefix="flaskcars-tests-")
+
+# Read by the app factories, so they are set before the app package is imported
+os.environ.update(
+    DATABASE_URI=f"sqlite:///{os.path.join(_DATABASE_DIR, 'test.db')}",
+    CACHE_REDIS_URL="",
+    REDIS_URL="",
+    PASSWORD_HASH_WORKERS="0",
+    LAST_LOGIN_BUFFERED="false",
+    CELERY_BROKER_URL="memory://",
+    CELERY_RESULT_BACKEND="cache+memory://",
+)
+
+import fakeredis
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.cache import cache
+from app.models import CarMake, CarModel, CarYear
+from app.routes.auth.tokens import token_cache
+from app.routes.car.caching import response_cache
+
+pytest_plugins = ["app.testing"]
+
+TEST_EMAIL = "tester@example.com"
+TEST_PASSWORD = "Test!Passw0rd"
+
+
+# Compares like MySQL's default utf8mb4_0900_ai_ci: ignoring case and accents
+ACCENT_INSENSITIVE = "ACCENT_INSENSITIVE"
+
+
+def _fold_accents(value):
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _compare_accent_insensitive(left, right):
+    left, right = _fold_accents(left), _fold_accents(right)
+    return (left > right) - (left < right)
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    with app.app_context():
+        @event.listens_for(db.engine, "connect")
+        def _register_collation(dbapi_connection, connection_record):
+            dbapi_connection.create_collation(ACCENT_INSENSITIVE, _compare_accent_insensitive)
+        db.engine.dispose()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    yield
+    with app.app_context():
+        db.session.remove()
+    token_cache.clear()
+    response_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post("/auth/signup", json={"email": TEST_EMAIL, "password": TEST_PASSWORD})
+    assert response.status_code == 201, response.get_json()
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Back the cache with an in-memory Redis and turn the response cache on."""
+    monkeypatch.setattr(cache, "_redis", fakeredis.FakeRedis())
+    monkeypatch.setattr(response_cache, "enabled", True)
+    return cache
+
+
+@pytest.fixture
+def catalog(app):
+    """Three makes with three models of three years each; returns the make ids."""
+    with app.app_context():
+        make_ids = []
+        for make_index in range(3):
+            make = CarMake(name=f"Make {make_index}")
+            db.session.add(make)
+            db.session.flush()
+            for model_index in range(3):
+                model = CarModel(name=f"Model {make_index}.{model_index}", make_id=make.id)
+                db.session.add(model)
+                db.session.flush()
+                db.session.add_all(CarYear(year=year, model_id=model.id) for year in range(2020, 2023))
+            make_ids.append(make.id)
+        db.session.commit()
+        return make_ids
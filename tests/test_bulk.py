@@ -0,0 +1,72 @@
+from app import db
+from app.models import CarMake, CarModel, CarYear
+from app.testing import assert_max_queries
+
+
+def _statuses(response):
+    return [result["status"] for result in response.get_json()["results"]]
+
+
+def test_bulk_create_uses_the_same_queries_for_any_batch_size(app, client, auth_headers):
+    client.get("/cars/makes", headers=auth_headers)
+    counts = []
+    for size in (1, 50):
+        items = [{"name": f"Batch {size} make {index}"} for index in range(size)]
+        with assert_max_queries(app, 10) as counter:
+            response = client.post("/cars/makes/bulk", json=items, headers=auth_headers)
+        assert _statuses(response) == ["created"] * size
+        counts.append(len(counter))
+    assert counts[0] == counts[1]
+
+
+def test_bulk_create_reports_conflicts_per_item(client, auth_headers, catalog):
+    response = client.post(
+        "/cars/makes/bulk",
+        json=[{"name": "Make 0"}, {"name": "Fresh"}, {"name": "fresh"}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert _statuses(response) == ["conflict", "created", "conflict"]
+
+
+def test_bulk_create_rejects_unknown_parents(client, auth_headers, catalog):
+    response = client.post(
+        "/cars/models/bulk",
+        json=[{"name": "New model", "make_id": catalog[0]}, {"name": "Orphan", "make_id": "missing"}],
+        headers=auth_headers,
+    )
+    assert _statuses(response) == ["created", "invalid"]
+
+
+def test_bulk_update_and_missing_ids(app, client, auth_headers, catalog):
+    response = client.put(
+        "/cars/makes/bulk",
+        json=[{"id": catalog[0], "name": "Renamed"}, {"id": "missing", "name": "Nobody"}],
+        headers=auth_headers,
+    )
+    assert _statuses(response) == ["updated", "not_found"]
+    with app.app_context():
+        assert db.session.get(CarMake, catalog[0]).name == "Renamed"
+
+
+def test_bulk_delete_cascades_to_models_and_years(app, client, auth_headers, catalog):
+    response = client.delete(
+        "/cars/makes/bulk",
+        json=[{"id": catalog[0]}, {"id": "missing"}],
+        headers=auth_headers,
+    )
+    assert _statuses(response) == ["deleted", "not_found"]
+    with app.app_context():
+        assert db.session.query(CarMake).count() == 2
+        assert db.session.query(CarModel).count() == 6
+        assert db.session.query(CarYear).count() == 18
+
+
+def test_bulk_rejects_empty_and_oversized_batches(app, client, auth_headers, monkeypatch):
+    response = client.post("/cars/makes/bulk", json=[], headers=auth_headers)
+    assert response.status_code == 400
+
+    monkeypatch.setitem(app.config, "BULK_MAX_ITEMS", 2)
+    response = client.post("/cars/makes/bulk", json=[{"name": str(index)} for index in range(3)], headers=auth_headers)
+    assert response.status_code == 400
+    assert "At most 2 items" in response.get_json()["message"]
@@ -0,0 +1,57 @@
+from app.testing import assert_endpoint_queries
+
+
+def test_without_redis_responses_are_neither_cached_nor_validated(client, auth_headers, catalog):
+    response = client.get("/cars/makes", headers=auth_headers)
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert "X-Cache" not in response.headers
+
+
+def test_cached_list_is_served_without_queries(client, auth_headers, catalog, shared_cache):
+    first = client.get("/cars/makes", headers=auth_headers)
+    assert first.headers["X-Cache"] == "MISS"
+    second = assert_endpoint_queries(client, 0, "/cars/makes", headers=auth_headers)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_data() == first.get_data()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_matching_etag_is_answered_with_304_without_queries(client, auth_headers, catalog, shared_cache):
+    path = f"/cars/makes/{catalog[0]}"
+    first = client.get(path, headers=auth_headers)
+    etag = first.headers["ETag"]
+    response = assert_endpoint_queries(client, 0, path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    since = first.headers["Last-Modified"]
+    response = assert_endpoint_queries(client, 0, path, headers={**auth_headers, "If-Modified-Since": since})
+    assert response.status_code == 304
+
+
+def test_write_invalidates_cached_list_and_etag(client, auth_headers, catalog, shared_cache):
+    before = client.get("/cars/makes", headers=auth_headers)
+    assert before.get_json()["pagination"]["total"] == 3
+
+    assert client.post("/cars/makes", json={"name": "Make 3"}, headers=auth_headers).status_code == 200
+
+    after = client.get("/cars/makes", headers={**auth_headers, "If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.get_json()["pagination"]["total"] == 4
+
+
+def test_bulk_write_invalidates_dependent_tree(client, auth_headers, catalog, shared_cache):
+    path = f"/cars/makes/{catalog[0]}/tree"
+    before = client.get(path, headers=auth_headers)
+    model_id = before.get_json()["models"][0]["id"]
+
+    response = client.post("/cars/years/bulk", json=[{"year": 2030, "model_id": model_id}], headers=auth_headers)
+    assert response.get_json()["results"][0]["status"] == "created"
+
+    after = client.get(path, headers={**auth_headers, "If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    years = next(model["years"] for model in after.get_json()["models"] if model["id"] == model_id)
+    assert 2030 in [year["year"] for year in years]
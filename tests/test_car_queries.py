@@ -0,0 +1,86 @@
+import base64
+import json
+import pytest
+from app.testing import assert_endpoint_queries, assert_max_queries
+from app.routes.car.pagination import encode_cursor
+
+
+@pytest.fixture
+def warm_headers(client, auth_headers):
+    # The first request also loads the user; later ones find it in the principal cache
+    client.get("/cars/makes", headers=auth_headers)
+    return auth_headers
+
+
+@pytest.mark.parametrize("path", ["/cars/makes", "/cars/models", "/cars/years"])
+def test_list_is_one_count_and_one_page_query(client, warm_headers, catalog, path):
+    response = assert_endpoint_queries(client, 2, path, headers=warm_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("query", ["count=none", "cursor=&count=none"])
+def test_list_without_count_is_one_query(client, warm_headers, catalog, query):
+    response = assert_endpoint_queries(client, 1, f"/cars/years?{query}", headers=warm_headers)
+    assert response.status_code == 200
+    assert response.get_json()["pagination"]["has_next"] is True
+
+
+def test_list_query_count_does_not_grow_with_page_size(app, client, warm_headers, catalog, query_counter):
+    counts = []
+    for per_page in (1, 27):
+        query_counter.statements.clear()
+        with query_counter.count(app):
+            response = client.get(f"/cars/years?per_page={per_page}", headers=warm_headers)
+        assert len(response.get_json()["items"]) == per_page
+        counts.append(len(query_counter))
+    assert counts[0] == counts[1]
+
+
+def test_make_detail_is_one_query(client, warm_headers, catalog):
+    response = assert_endpoint_queries(client, 1, f"/cars/makes/{catalog[0]}", headers=warm_headers)
+    assert response.get_json()["id"] == catalog[0]
+
+
+def test_make_tree_is_three_queries(client, warm_headers, catalog):
+    response = assert_endpoint_queries(client, 3, f"/cars/makes/{catalog[0]}/tree", headers=warm_headers)
+    models = response.get_json()["models"]
+    assert len(models) == 3
+    assert all(len(model["years"]) == 3 for model in models)
+
+
+def test_assert_max_queries_reports_the_statements(app, client, warm_headers, catalog):
+    with pytest.raises(AssertionError, match="expected at most 0") as error:
+        with assert_max_queries(app, 0):
+            client.get("/cars/makes", headers=warm_headers)
+    assert "FROM car_makes" in str(error.value)
+
+
+@pytest.mark.parametrize("query", ["per_page=0", "per_page=-1", "per_page=1001", "page=0"])
+def test_invalid_pagination_is_rejected(client, auth_headers, query):
+    response = client.get(f"/cars/makes?{query}", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Validation error"
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(None), encode_cursor(7), encode_cursor(["id"])])
+def test_malformed_cursor_is_rejected(client, auth_headers, cursor):
+    response = client.get(f"/cars/makes?cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_object_cursor_is_rejected(client, auth_headers):
+    cursor = base64.urlsafe_b64encode(json.dumps({"a": 1}).encode()).decode()
+    response = client.get(f"/cars/makes?cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_largest_page_is_served(client, auth_headers, catalog):
+    response = client.get("/cars/years?per_page=1000", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()["items"]) == 27
+
+
+def test_auth_validation_errors_are_400(client):
+    response = client.post("/auth/signup", json={"email": 5, "password": "x"})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Validation error"
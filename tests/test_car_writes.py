@@ -0,0 +1,29 @@
+from app import db
+from app.models import CarMake, CarModel
+
+
+def test_creating_a_duplicate_make_is_a_conflict(client, auth_headers, catalog):
+    response = client.post("/cars/makes", json={"name": "Make 0"}, headers=auth_headers)
+    assert response.status_code == 409
+    assert response.get_json()["error"] == "Conflict"
+    # The session was rolled back and keeps serving requests
+    assert client.post("/cars/makes", json={"name": "Make 9"}, headers=auth_headers).status_code == 200
+
+
+def test_renaming_onto_an_existing_name_is_a_conflict(app, client, auth_headers, catalog):
+    response = client.put(f"/cars/makes/{catalog[0]}", json={"name": "Make 1"}, headers=auth_headers)
+    assert response.status_code == 409
+    with app.app_context():
+        assert db.session.get(CarMake, catalog[0]).name == "Make 0"
+
+
+def test_duplicate_model_and_year_are_conflicts(app, client, auth_headers, catalog):
+    with app.app_context():
+        model = db.session.execute(db.select(CarModel).filter_by(name="Model 0.0")).scalar_one()
+        model_id, make_id = model.id, model.make_id
+    response = client.post("/cars/models", json={"name": "Model 0.1", "make_id": make_id}, headers=auth_headers)
+    assert response.status_code == 409
+    response = client.put(f"/cars/models/{model_id}", json={"name": "Model 0.1", "make_id": make_id}, headers=auth_headers)
+    assert response.status_code == 409
+    response = client.post("/cars/years", json={"year": 2020, "model_id": model_id}, headers=auth_headers)
+    assert response.status_code == 409
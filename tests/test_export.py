@@ -0,0 +1,55 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from app.routes.car import export
+from app.routes.car.export import EXPORT_COLUMNS
+
+
+def _export(client, headers, query="", encoding=None):
+    if encoding is not None:
+        headers = {**headers, "Accept-Encoding": encoding}
+    return client.get(f"/cars/export{query}", headers=headers)
+
+
+def test_ndjson_lists_every_year_in_catalog_order(client, auth_headers, catalog, monkeypatch):
+    # Small batches so the rows arrive from several partitions
+    monkeypatch.setattr(export.catalog_rows, "__defaults__", (4,))
+    response = _export(client, auth_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert "Content-Encoding" not in response.headers
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 27
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert [(row["make"], row["model"], row["year"]) for row in rows] == sorted(
+        (row["make"], row["model"], row["year"]) for row in rows
+    )
+
+
+def test_csv_has_a_header_and_one_line_per_year(client, auth_headers, catalog):
+    response = _export(client, auth_headers, "?format=csv")
+    assert response.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert len(rows) == 28
+
+
+def test_empty_catalog_exports_only_the_csv_header(client, auth_headers):
+    response = _export(client, auth_headers, "?format=csv")
+    assert response.get_data(as_text=True).splitlines() == [",".join(EXPORT_COLUMNS)]
+
+
+@pytest.mark.parametrize("encoding, gzipped", [("gzip", True), ("gzip;q=0", False), ("identity", False)])
+def test_gzip_follows_accept_encoding(client, auth_headers, catalog, encoding, gzipped):
+    response = _export(client, auth_headers, "?format=csv", encoding=encoding)
+    body = response.get_data()
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert (response.headers.get("Content-Encoding") == "gzip") is gzipped
+    text = gzip.decompress(body).decode() if gzipped else body.decode()
+    assert len(text.splitlines()) == 28
+
+
+def test_invalid_format_is_rejected(client, auth_headers):
+    assert _export(client, auth_headers, "?format=xml").status_code == 400
@@ -0,0 +1,68 @@
+import pytest
+import requests
+from app.tasks.car_fetcher import CarDataFetcher
+from benchmarks.fake_parse_api import FakeParseAPI, make_records
+
+PAGE_SIZE = 100
+
+
+@pytest.fixture
+def api():
+    with FakeParseAPI(make_records(250)) as api:
+        yield api
+
+
+def _fetcher(api, **kwargs):
+    return CarDataFetcher(url=api.url, page_size=PAGE_SIZE, headers={}, **kwargs)
+
+
+def _ids(records):
+    return [record["objectId"] for record in records]
+
+
+def test_pages_are_walked_in_object_id_order(api):
+    pages = list(_fetcher(api, concurrency=1).iter_pages())
+    assert [len(results) for results, _ in pages] == [100, 100, 50]
+    assert [cursor for _, cursor in pages] == [results[-1]["objectId"] for results, _ in pages]
+    assert _ids(record for results, _ in pages for record in results) == _ids(api.records)
+    # A short page ends the walk without requesting an empty one
+    assert api.requests == 3
+
+
+def test_walk_resumes_after_the_cursor(api):
+    cursor = api.records[99]["objectId"]
+    records = list(_fetcher(api, concurrency=1).iter_records(cursor))
+    assert _ids(records) == _ids(api.records[100:])
+
+
+def test_walk_stops_at_the_upper_bound(api):
+    upto = api.records[149]["objectId"]
+    records = list(_fetcher(api, concurrency=1, upto=upto).iter_records(api.records[9]["objectId"]))
+    assert _ids(records) == _ids(api.records[10:150])
+
+
+@pytest.mark.parametrize("count", [0, 100, 250])
+@pytest.mark.parametrize("concurrency", [2, 4])
+def test_concurrent_walk_returns_the_serial_pages(count, concurrency):
+    with FakeParseAPI(make_records(count)) as api:
+        serial = list(_fetcher(api, concurrency=1).iter_pages())
+        concurrent = list(_fetcher(api, concurrency=concurrency, prefetch_pages=1).iter_pages())
+    assert concurrent == serial
+
+
+def test_stopping_early_releases_the_producer(api):
+    pages = _fetcher(api, concurrency=4, prefetch_pages=1).iter_pages()
+    first, _ = next(pages)
+    pages.close()
+    assert _ids(first) == _ids(api.records[:100])
+
+
+class _DownSession:
+    def get(self, *args, **kwargs):
+        raise requests.ConnectionError("upstream down")
+
+
+def test_fetch_errors_reach_the_consumer():
+    fetcher = CarDataFetcher(url="http://upstream.invalid", headers={}, session=_DownSession(), concurrency=4)
+    with pytest.raises(requests.ConnectionError):
+        list(fetcher.iter_pages())
@@ -0,0 +1,57 @@
+import fakeredis
+import pytest
+from conftest import TEST_EMAIL, TEST_PASSWORD
+from app import db
+from app.cache import cache
+from app.models import User
+from app.routes.auth.last_login import last_login_buffer
+
+
+@pytest.fixture
+def buffered(monkeypatch, auth_headers):
+    monkeypatch.setattr(last_login_buffer, "enabled", True)
+    monkeypatch.setattr(last_login_buffer, "_pending", {})
+    # The tests flush by hand instead of through the background thread
+    monkeypatch.setattr(last_login_buffer, "_flusher", object())
+    return last_login_buffer
+
+
+def _login(client):
+    response = client.post("/auth/login", json={"email": TEST_EMAIL, "password": TEST_PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["user"]["last_login_at"]
+
+
+def _stored_last_login(app):
+    with app.app_context():
+        user = db.session.execute(db.select(User).filter_by(email=TEST_EMAIL)).scalar_one()
+        return user.last_login_at.isoformat() if user.last_login_at else None
+
+
+@pytest.mark.parametrize("connected", [True, False], ids=["redis", "redis-down"])
+def test_logins_are_buffered_until_flushed(app, client, buffered, monkeypatch, connected):
+    server = fakeredis.FakeServer()
+    server.connected = connected
+    monkeypatch.setattr(cache, "_redis", fakeredis.FakeRedis(server=server))
+    _login(client)
+    last_login_at = _login(client)
+    assert _stored_last_login(app) is None
+    with app.app_context():
+        assert buffered.flush() == 1
+        assert buffered.flush() == 0
+    assert _stored_last_login(app) == last_login_at
+
+
+def test_failed_flush_keeps_the_logins(app, client, buffered, monkeypatch):
+    last_login_at = _login(client)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    with app.app_context():
+        with monkeypatch.context() as patch:
+            patch.setattr(db.session, "execute", fail)
+            with pytest.raises(RuntimeError):
+                buffered.flush()
+        assert buffered.flush() == 1
+    assert _stored_last_login(app) == last_login_at
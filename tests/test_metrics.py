@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+from prometheus_client.parser import text_string_to_metric_families
+
+# prometheus_client picks multiprocess mode at import, so each "worker" is its own interpreter
+_WORKER = """
+import sys
+from app import create_app
+client = create_app().test_client()
+for _ in range(int(sys.argv[1])):
+    assert client.get("/health").status_code == 200
+sys.stdout.buffer.write(client.get("/metrics").data)
+"""
+
+
+def _run_worker(env, requests):
+    return subprocess.run(
+        [sys.executable, "-c", _WORKER, str(requests)], env=env, check=True, capture_output=True, cwd=os.getcwd()
+    ).stdout.decode()
+
+
+def _health_requests(text):
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == "http_requests_total" and sample.labels["endpoint"] == "health.health":
+                return sample.value
+    return 0
+
+
+def test_server_timing_reports_the_queries(client, auth_headers, catalog, monkeypatch):
+    from app.metrics import metrics
+    monkeypatch.setattr(metrics, "server_timing", True)
+    client.get("/cars/makes", headers=auth_headers)
+    response = client.get("/cars/makes", headers=auth_headers)
+    # One count and one page query once the user is cached
+    assert 'db;dur=' in response.headers["Server-Timing"]
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+
+def test_metrics_add_up_every_process(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "METRICS_ENABLED": "true"}
+    _run_worker(env, 2)
+    # The last process serves the scrape and still reports the first one's requests
+    assert _health_requests(_run_worker(env, 3)) == 5
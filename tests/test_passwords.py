@@ -0,0 +1,76 @@
+import os
+import signal
+from types import SimpleNamespace
+import pytest
+from werkzeug.security import generate_password_hash
+from conftest import TEST_EMAIL, TEST_PASSWORD
+from app import db
+from app.models import User
+from app.routes.auth.passwords import PasswordHasher, PasswordHasherBusy, password_hasher
+
+
+def _password_hash(app):
+    with app.app_context():
+        return db.session.execute(db.select(User.password_hash).filter_by(email=TEST_EMAIL)).scalar_one()
+
+
+def _login(client):
+    return client.post("/auth/login", json={"email": TEST_EMAIL, "password": TEST_PASSWORD})
+
+
+def test_login_upgrades_an_outdated_hash_once(app, client):
+    with app.app_context():
+        db.session.add(User(email=TEST_EMAIL, password_hash=generate_password_hash(TEST_PASSWORD, "pbkdf2:sha256:1000")))
+        db.session.commit()
+    assert _login(client).status_code == 200
+    upgraded = _password_hash(app)
+    assert not password_hasher.needs_rehash(upgraded)
+    assert _login(client).status_code == 200
+    assert _password_hash(app) == upgraded
+
+
+def test_busy_hasher_answers_503(client, monkeypatch):
+    def busy(password):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(password_hasher, "hash", busy)
+    response = client.post("/auth/signup", json={"email": TEST_EMAIL, "password": TEST_PASSWORD})
+    assert response.status_code == 503
+
+
+@pytest.fixture
+def pooled():
+    hasher = PasswordHasher()
+    hasher.init_app(SimpleNamespace(config={
+        "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+        "PASSWORD_HASH_WORKERS": 1,
+        "PASSWORD_HASH_MAX_PENDING": 2,
+        "PASSWORD_HASH_TIMEOUT_SECONDS": 30,
+    }))
+    yield hasher
+    hasher.shutdown()
+
+
+def test_pool_hashes_and_verifies(pooled):
+    pwhash = pooled.hash(TEST_PASSWORD)
+    assert pooled.verify(pwhash, TEST_PASSWORD)
+    assert not pooled.verify(pwhash, "wrong")
+
+
+def test_pool_whose_process_died_is_replaced(pooled):
+    pooled.hash(TEST_PASSWORD)
+    broken = pooled._pool
+    for process in list(broken._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+    pwhash = pooled.hash(TEST_PASSWORD)
+    assert pooled.verify(pwhash, TEST_PASSWORD)
+    assert pooled._pool is not broken
+
+
+def test_no_free_slot_fails_fast(pooled):
+    pooled.timeout = 0
+    pooled._slots.acquire()
+    pooled._slots.acquire()
+    with pytest.raises(PasswordHasherBusy):
+        pooled.hash(TEST_PASSWORD)
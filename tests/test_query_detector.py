@@ -0,0 +1,61 @@
+import logging
+import pytest
+from sqlalchemy import event
+from app import db
+from app.query_detector import QueryDetector, statement_shape
+from app.tasks.car_sync import get_sync_state
+
+
+@pytest.fixture
+def detector(app):
+    detector = QueryDetector()
+    detector.enabled = True
+    detector.repeat_threshold = 3
+    detector.slow_seconds = 60
+    with app.app_context():
+        engine = db.engine
+    hooks = (("before_cursor_execute", detector._before_cursor_execute),
+             ("after_cursor_execute", detector._after_cursor_execute))
+    for name, hook in hooks:
+        event.listen(engine, name, hook)
+    yield detector
+    for name, hook in hooks:
+        event.remove(engine, name, hook)
+
+
+def _warnings(caplog, prefix):
+    return [record.getMessage() for record in caplog.records
+            if record.levelno == logging.WARNING and record.getMessage().startswith(prefix)]
+
+
+def test_repeated_statement_shape_is_reported_with_its_origin(app, detector, caplog):
+    with app.app_context(), caplog.at_level(logging.WARNING, logger="app.query_detector"):
+        with detector.scope("task n_plus_one"):
+            for index in range(3):
+                get_sync_state(f"key {index}")
+    (message,) = _warnings(caplog, "Possible N+1")
+    assert "3 identical statements in task n_plus_one" in message
+    assert "app/tasks/car_sync.py" in message
+
+
+def test_statements_below_the_threshold_are_not_reported(app, detector, caplog):
+    with app.app_context(), caplog.at_level(logging.WARNING, logger="app.query_detector"):
+        with detector.scope("task few"):
+            for index in range(2):
+                get_sync_state(f"key {index}")
+    assert _warnings(caplog, "Possible N+1") == []
+
+
+def test_slow_statements_are_reported_right_away(app, detector, caplog):
+    detector.slow_seconds = 0
+    with app.app_context(), caplog.at_level(logging.WARNING, logger="app.query_detector"):
+        with detector.scope("task slow"):
+            get_sync_state("key")
+            assert _warnings(caplog, "Slow query")
+    assert "in task slow" in _warnings(caplog, "Slow query")[0]
+
+
+def test_in_lists_of_any_length_have_one_shape():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT * FROM t\n WHERE id IN (?)"
+    )
@@ -0,0 +1,59 @@
+import pytest
+from app import db
+from app.models import CarMake, CarModel
+
+
+@pytest.fixture
+def named_catalog(app):
+    with app.app_context():
+        for make_name, model_names in (
+            ("Toyota", ("Corolla", "Camry", "Corolla Cross")),
+            ("Chevrolet", ("Corvette", "Camaro")),
+            ("Tesla", ("Model 3",)),
+        ):
+            make = CarMake(name=make_name)
+            db.session.add(make)
+            db.session.flush()
+            db.session.add_all(CarModel(name=name, make_id=make.id) for name in model_names)
+        db.session.commit()
+
+
+def _search(client, headers, q, limit=None):
+    query = {"q": q} if limit is None else {"q": q, "limit": limit}
+    response = client.get("/cars/search", query_string=query, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    return [make["name"] for make in body["makes"]], [(model["make"], model["name"]) for model in body["models"]]
+
+
+def test_every_word_must_prefix_a_name_word(client, auth_headers, named_catalog):
+    assert _search(client, auth_headers, "toyota cor") == (
+        [], [("Toyota", "Corolla"), ("Toyota", "Corolla Cross")]
+    )
+    assert _search(client, auth_headers, "CROSS") == ([], [("Toyota", "Corolla Cross")])
+
+
+def test_matches_are_ordered_by_make_then_model_and_limited(client, auth_headers, named_catalog):
+    makes, models = _search(client, auth_headers, "c")
+    assert makes == ["Chevrolet"]
+    assert models == [
+        ("Chevrolet", "Camaro"), ("Chevrolet", "Corvette"),
+        ("Toyota", "Camry"), ("Toyota", "Corolla"), ("Toyota", "Corolla Cross"),
+    ]
+    assert _search(client, auth_headers, "c", limit=2)[1] == models[:2]
+
+
+def test_renames_and_deletes_update_the_index(app, client, auth_headers, named_catalog):
+    with app.app_context():
+        tesla = db.session.execute(db.select(CarMake).filter_by(name="Tesla")).scalar_one()
+        tesla_id = tesla.id
+    assert client.put(f"/cars/makes/{tesla_id}", json={"name": "Polestar"}, headers=auth_headers).status_code == 200
+    assert _search(client, auth_headers, "tesla") == ([], [])
+    assert _search(client, auth_headers, "polestar model") == ([], [("Polestar", "Model 3")])
+
+    assert client.delete(f"/cars/makes/{tesla_id}", headers=auth_headers).status_code == 200
+    assert _search(client, auth_headers, "polestar") == ([], [])
+
+
+def test_query_without_words_finds_nothing(client, auth_headers, named_catalog):
+    assert _search(client, auth_headers, "!!") == ([], [])
@@ -0,0 +1,173 @@
+import pytest
+from app import db
+from app.models import CarMake, CarModel, CarYear
+from app.constants import SYNC_CURSOR_STATE_KEY
+from app.tasks.car_sync import CarCatalogUpserter, get_sync_state
+from benchmarks.fake_parse_api import FakeParseAPI, make_records
+from conftest import ACCENT_INSENSITIVE
+
+RECORDS = 300
+
+
+def _row_counts():
+    return tuple(db.session.query(model).count() for model in (CarMake, CarModel, CarYear))
+
+
+def _inserted(stats):
+    return {table: counts["inserted"] for table, counts in stats.items()}
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """The Celery worker app running tasks eagerly against a local fake of Back4App."""
+    from app.tasks import car_tasks
+    from app.tasks.celery_app import celery_app, flask_app
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_app.conf, "task_eager_propagates", True)
+    with FakeParseAPI(make_records(RECORDS)) as api:
+        fetcher = car_tasks._fetcher
+        monkeypatch.setattr(car_tasks, "_fetcher", lambda **kwargs: fetcher(url=api.url, **kwargs))
+        yield flask_app
+
+
+def _sync(mode=None):
+    from app.tasks.car_tasks import carDataSync
+    return carDataSync.delay(mode).get()
+
+
+def test_upserting_the_same_records_twice_changes_nothing(app):
+    records = [{"Make": "Toyota", "Model": "Corolla", "Year": year} for year in (2019, 2020)]
+    records.append({"Make": "Honda", "Model": "Civic", "Year": 2020})
+    with app.app_context():
+        first = CarCatalogUpserter()
+        first.upsert(records)
+        db.session.commit()
+        counts = _row_counts()
+
+        second = CarCatalogUpserter()
+        second.upsert(records)
+        db.session.commit()
+        assert _row_counts() == counts == (2, 2, 3)
+        assert _inserted(second.stats) == {"makes": 0, "models": 0, "years": 0}
+
+
+@pytest.mark.parametrize("collation, stored", [
+    ("BINARY", (5, 5, 5)),
+    ("NOCASE", (3, 4, 5)),
+    (ACCENT_INSENSITIVE, (2, 3, 5)),
+])
+def test_every_spelling_of_a_name_is_resolved(app, monkeypatch, collation, stored):
+    for model in (CarMake, CarModel):
+        monkeypatch.setattr(model.__table__.c.name.type, "collation", collation)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    records = [
+        {"Make": "Citroen", "Model": "C3", "Year": 2018},
+        {"Make": "BMW", "Model": "X5", "Year": 2020},
+        {"Make": "bmw", "Model": "x5", "Year": 2021},
+        {"Make": "Bmw", "Model": "M3", "Year": 2019},
+        {"Make": "Citroën", "Model": "c3", "Year": 2019},
+    ]
+    with app.app_context():
+        # The first batch stores one spelling; the second meets the others already stored
+        for batch in (records[:2], records, records):
+            upserter = CarCatalogUpserter()
+            upserter.upsert(batch)
+            db.session.commit()
+        assert _row_counts() == stored
+        assert _inserted(upserter.stats) == {"makes": 0, "models": 0, "years": 0}
+
+
+@pytest.mark.parametrize("fanout", [False, True])
+def test_sync_task_is_idempotent(worker, monkeypatch, fanout):
+    monkeypatch.setitem(worker.config, "SYNC_FANOUT", fanout)
+    monkeypatch.setitem(worker.config, "SYNC_CHUNK_SIZE", 100)
+
+    first = _sync()
+    with worker.app_context():
+        counts = _row_counts()
+    assert counts[2] == RECORDS
+    if not fanout:
+        assert first["status"] == "synced"
+        assert first["records"] == RECORDS
+
+    # Nothing changed upstream, so the incremental run stops at the watermark
+    assert _sync()["status"] == "up_to_date"
+
+    # A full run re-reads every record and writes nothing new
+    full = _sync("full")
+    with worker.app_context():
+        assert _row_counts() == counts
+    if not fanout:
+        assert full["records"] == RECORDS
+        assert _inserted(full["stats"]) == {"makes": 0, "models": 0, "years": 0}
+
+
+def test_interrupted_inline_sync_resumes_after_the_last_committed_page(worker, monkeypatch):
+    from app.tasks import car_tasks
+    monkeypatch.setitem(worker.config, "SYNC_FANOUT", False)
+    fetcher = car_tasks._fetcher
+    monkeypatch.setattr(car_tasks, "_fetcher", lambda **kwargs: fetcher(page_size=100, **kwargs))
+    upsert = CarCatalogUpserter.upsert
+    calls = []
+
+    def failing_upsert(self, records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise ValueError("page failed")
+        return upsert(self, records)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CarCatalogUpserter, "upsert", failing_upsert)
+        with pytest.raises(ValueError):
+            _sync()
+    with worker.app_context():
+        assert _row_counts()[2] == 100
+        assert get_sync_state(SYNC_CURSOR_STATE_KEY) == make_records(RECORDS)[99]["objectId"]
+
+    # The next run only fetches the pages after the saved cursor
+    result = _sync()
+    assert result["records"] == RECORDS - 100
+    with worker.app_context():
+        assert _row_counts()[2] == RECORDS
+        assert get_sync_state(SYNC_CURSOR_STATE_KEY) is None
+
+
+def test_chunk_commits_each_page_and_can_be_rerun(worker, monkeypatch):
+    from app.tasks import car_tasks
+    fetcher = car_tasks._fetcher
+    monkeypatch.setattr(car_tasks, "_fetcher", lambda **kwargs: fetcher(page_size=100, **kwargs))
+    upsert = CarCatalogUpserter.upsert
+    calls = []
+
+    def failing_upsert(self, records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise ValueError("page failed")
+        return upsert(self, records)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CarCatalogUpserter, "upsert", failing_upsert)
+        with pytest.raises(ValueError):
+            car_tasks.carDataSyncChunk.delay("", "9999999999").get()
+    with worker.app_context():
+        # The first page was committed before the second one failed
+        assert _row_counts()[2] == 100
+
+    result = car_tasks.carDataSyncChunk.delay("", "9999999999").get()
+    assert result["records"] == RECORDS
+    assert _inserted(result["stats"])["years"] == RECORDS - 100
+    with worker.app_context():
+        assert _row_counts()[2] == RECORDS
+
+
+def test_full_sync_replaces_the_incremental_run_on_its_day():
+    from app.tasks.celery_app import celery_app
+    schedule = celery_app.conf.beat_schedule
+    incremental = schedule["daily-data-sync"]["schedule"]
+    full = schedule["weekly-full-data-sync"]["schedule"]
+    assert schedule["weekly-full-data-sync"]["kwargs"] == {"mode": "full"}
+    assert incremental.hour == full.hour
+    assert not incremental.day_of_week & full.day_of_week
+    assert incremental.day_of_week | full.day_of_week == set(range(7))
@@ -0,0 +1,48 @@
+import pytest
+import requests
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from app.tasks.car_tasks import TransientSyncError, _failing, _is_transient
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def _mysql_error(error_class, code, invalidated=False):
+    return error_class("SELECT 1", {}, Exception(code, "message"), connection_invalidated=invalidated)
+
+
+@pytest.mark.parametrize("error, transient", [
+    (requests.ConnectionError(), True),
+    (requests.Timeout(), True),
+    (_http_error(429), True),
+    (_http_error(503), True),
+    (_http_error(404), False),
+    (_http_error(401), False),
+    (requests.HTTPError(), True),
+    (_mysql_error(OperationalError, 2006), True),
+    (_mysql_error(OperationalError, 2013), True),
+    (_mysql_error(OperationalError, 1205), True),
+    (_mysql_error(OperationalError, 1213), True),
+    # Unknown column: an OperationalError that no retry will fix
+    (_mysql_error(OperationalError, 1054), False),
+    (_mysql_error(ProgrammingError, 1146), False),
+    (_mysql_error(IntegrityError, 1062), False),
+    (_mysql_error(ProgrammingError, 0, invalidated=True), True),
+    (ValueError("bad record"), False),
+])
+def test_is_transient(error, transient):
+    assert _is_transient(error) is transient
+
+
+def test_failing_wraps_only_transient_errors(app):
+    with app.app_context():
+        with pytest.raises(TransientSyncError) as error:
+            with _failing("Fetch"):
+                raise requests.Timeout("slow upstream")
+        assert isinstance(error.value.__cause__, requests.Timeout)
+        with pytest.raises(ValueError):
+            with _failing("Parse"):
+                raise ValueError("bad record")
@@ -0,0 +1,34 @@
+import time
+import jwt
+from prometheus_client import REGISTRY
+from app.routes.auth.constants import JWT_ALGORITHM, JWT_SECRET_KEY_CONFIG_KEY
+from app.routes.auth.tokens import decode_token, token_cache
+
+
+def _lookups(result):
+    return REGISTRY.get_sample_value("auth_token_cache_requests_total", {"result": result}) or 0
+
+
+def _token(app, **claims):
+    return jwt.encode(claims, app.config[JWT_SECRET_KEY_CONFIG_KEY], algorithm=JWT_ALGORITHM)
+
+
+def test_cached_token_expires_with_its_exp_claim(app, monkeypatch):
+    now = time.time()
+    token = _token(app, sub="user", exp=int(now) + 60)
+    hits, misses = _lookups("hit"), _lookups("miss")
+    with app.app_context():
+        payload = decode_token(token)
+        assert decode_token(token) == payload
+        assert (_lookups("hit") - hits, _lookups("miss") - misses) == (1, 1)
+
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        assert token_cache.get(token) is None
+        assert _lookups("miss") - misses == 2
+
+
+def test_token_without_exp_is_never_cached(app):
+    token = _token(app, sub="user")
+    with app.app_context():
+        assert decode_token(token) == {"sub": "user"}
+        assert token_cache.get(token) is None